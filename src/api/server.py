@@ -11,6 +11,13 @@ from datetime import datetime
 import uuid
 import time
 
+# orjson renders response bodies several times faster than the stdlib encoder
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 from argus.config import config
 from argus.logging import get_logger, setup_logging
 from argus.exceptions import (
@@ -28,12 +35,12 @@ from src.core.traceability import traceability_manager, SourceType, DocumentType
 from src.core.alerting import alerting_manager, AlertSeverity, PatternType, AlertStatus
 from src.core.plugins import plugin_manager, PluginType
 from src.data.models import (
-    EntityCreate, EntityUpdate, EntityResponse,
+    EntityCreate, EntityBatchCreate, EntityUpdate, EntityResponse,
     RelationshipCreate, RelationshipResponse,
     SearchQuery, MatchRequest, MatchResponse,
     GraphResponse, PathRequest, PathResponse,
     NetworkRequest, StatsResponse,
-    ErrorResponse, PaginatedResponse
+    ErrorResponse, PaginatedResponse, BulkResponse
 )
 from src.data.storage import storage
 
@@ -47,7 +54,8 @@ app = FastAPI(
     description="Open Source Intelligence Platform",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=DefaultResponse
 )
 
 # CORS middleware
@@ -173,6 +181,32 @@ async def create_entity(entity: EntityCreate):
         logger.error(f"Failed to create entity: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/api/entities/batch", response_model=BulkResponse)
+async def create_entities_batch(batch: EntityBatchCreate):
+    """Create several entities in one request"""
+    try:
+        entity_objs = [
+            Entity(
+                id=entity.id or str(uuid.uuid4()),
+                type=entity.type.value,
+                name=entity.name,
+                attributes=entity.attributes,
+                source=entity.source,
+                confidence=entity.confidence
+            )
+            for entity in batch.entities
+        ]
+        
+        # Add to knowledge graph in a single pass
+        entity_ids = kg.add_entities(entity_objs)
+        
+        logger.info(f"Created {len(entity_ids)} entities")
+        return BulkResponse(successful=len(entity_ids), failed=0, ids=entity_ids)
+        
+    except Exception as e:
+        logger.error(f"Failed to create entities: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/api/entities/{entity_id}", response_model=EntityResponse)
 async def get_entity(entity_id: str):
     """Get entity details"""
@@ -405,26 +439,11 @@ async def find_paths(request: PathRequest):
 async def search_entities(query: SearchQuery):
     """Search for entities"""
     try:
-        results = kg.search_entities(query.query, query.entity_type.value if query.entity_type else None)
-        
-        # Apply filters
-        if query.filters:
-            for key, value in query.filters.items():
-                if isinstance(value, dict):
-                    if 'min' in value and 'max' in value:
-                        # Range filter
-                        results = [
-                            r for r in results 
-                            if key in r.get('attributes', {}) and 
-                            value['min'] <= r['attributes'][key] <= value['max']
-                        ]
-                else:
-                    # Exact match filter
-                    results = [
-                        r for r in results 
-                        if key in r.get('attributes', {}) and 
-                        r['attributes'][key] == value
-                    ]
+        results = kg.search_entities(
+            query.query,
+            query.entity_type.value if query.entity_type else None,
+            filters=query.filters
+        )
         
         # Apply pagination
         total = len(results)
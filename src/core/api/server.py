@@ -5,6 +5,7 @@ from typing import List, Optional
 import uvicorn
 from datetime import datetime
 import uuid
+from dataclasses import asdict
 
 from argus.config import config
 from argus.logging import get_logger, setup_logging
@@ -79,7 +80,7 @@ async def create_entity(entity: EntityCreate):
     return {
         "id": entity_id,
         "status": "created",
-        "entity": kg.entity_index[entity_id].__dict__
+        "entity": asdict(kg.entity_index[entity_id])
     }
 
 @app.get("/api/entities/{entity_id}")
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
@@ -17,7 +18,17 @@ from argus.exceptions import (
     CacheError
 )
 
-@dataclass
+# Upper bound on memoized path/network queries kept between mutations
+QUERY_CACHE_SIZE = 1024
+
+# Node attributes set by the graph itself, which entity attributes may not use
+RESERVED_NODE_ATTRIBUTES = frozenset({'type', 'name', 'source', 'confidence', 'created_at'})
+
+def _trigrams(text: str) -> Set[str]:
+    """Split text into its set of overlapping three-character substrings"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+@dataclass(slots=True)
 class Entity:
     id: str
     type: str
@@ -36,6 +47,34 @@ class KnowledgeGraph:
         self.type_index = defaultdict(set)
         self.attribute_index = defaultdict(set)
         
+        # Trigram index over lowercased names and string attribute values,
+        # used to narrow substring searches to candidate entities
+        self.trigram_index = defaultdict(set)
+        self._entity_trigrams = {}
+        
+        # Insertion rank of each entity, so indexed searches can return
+        # results in the same order as a scan of entity_index
+        self._entity_rank = {}
+        self._next_rank = 0
+        
+        # In-process memoization, invalidated whenever the graph is mutated
+        self._version = 0
+        self._entity_dict_cache = {}
+        self._stats_cache = None
+        self._adjacency = None
+        self._numeric_columns = {}
+        self._query_cache = {}
+        
+        # Incremental statistics, updated as nodes and edges are added so
+        # get_graph_stats avoids whole-graph traversals. Triangles are counted
+        # per node over distinct neighbors; connected components are tracked
+        # with a union-find that is rebuilt lazily after deletions.
+        self._edge_count = 0
+        self._linked_nodes = 0
+        self._triangles = defaultdict(int)
+        self._uf_parent = {}
+        self._component_count = 0
+        
         # Redis cache for performance
         self.redis = None
         if use_cache:
@@ -65,27 +104,17 @@ class KnowledgeGraph:
             if entity_id in self.entity_index:
                 self.logger.warning(f"Entity {entity_id} already exists, updating")
             
-            # Add to graph
-            self.graph.add_node(
-                entity_id,
-                type=entity.type,
-                name=entity.name,
-                source=entity.source,
-                confidence=entity.confidence,
-                created_at=datetime.utcnow().isoformat(),
-                **entity.attributes
-            )
+            # Add to graph, tracking the node only once the insert succeeded
+            is_new = entity_id not in self.graph
+            self.graph.add_node(entity_id, **self._node_attributes(entity, datetime.utcnow().isoformat()))
+            if is_new:
+                self._track_new_node(entity_id)
             
             # Update indexes
-            self.entity_index[entity_id] = entity
-            self.type_index[entity.type].add(entity_id)
-            
-            # Update attribute index
-            for attr_key, attr_value in entity.attributes.items():
-                if isinstance(attr_value, str):
-                    self.attribute_index[f"{attr_key}:{attr_value}"].add(entity_id)
+            self._index_entity(entity)
             
             # Clear cache
+            self._mark_mutated()
             self._clear_entity_cache(entity_id)
             
             self.logger.info(f"Added entity {entity_id} of type {entity.type}")
@@ -95,32 +124,130 @@ class KnowledgeGraph:
             self.logger.error(f"Failed to add entity {entity.id}: {e}")
             raise GraphError(f"Failed to add entity: {e}", "add_entity")
     
+    def add_entities(self, entities: List[Entity]) -> List[str]:
+        """Add several entities to the knowledge graph in a single pass"""
+        try:
+            created_at = datetime.utcnow().isoformat()
+            
+            # Add to graph, tracking new nodes only once the insert succeeded
+            # Every entity is validated before any node is inserted
+            nodes = [(entity.id, self._node_attributes(entity, created_at)) for entity in entities]
+            new_ids = {entity.id for entity in entities} - self.graph.nodes.keys()
+            self.graph.add_nodes_from(nodes)
+            for entity_id in new_ids:
+                self._track_new_node(entity_id)
+            
+            # Update indexes and clear cache
+            self._mark_mutated()
+            for entity in entities:
+                self._index_entity(entity)
+                self._clear_entity_cache(entity.id)
+            
+            self.logger.info(f"Added {len(entities)} entities")
+            return [entity.id for entity in entities]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to add entities: {e}")
+            raise GraphError(f"Failed to add entities: {e}", "add_entities")
+    
+    @staticmethod
+    def _node_attributes(entity: Entity, created_at: str) -> Dict[str, Any]:
+        """Build the graph node attributes of an entity"""
+        reserved = RESERVED_NODE_ATTRIBUTES.intersection(entity.attributes)
+        if reserved:
+            raise ValueError(f"Entity {entity.id} uses reserved attribute names: {sorted(reserved)}")
+        
+        return {
+            "type": entity.type,
+            "name": entity.name,
+            "source": entity.source,
+            "confidence": entity.confidence,
+            "created_at": created_at,
+            **entity.attributes
+        }
+    
+    def _index_entity(self, entity: Entity):
+        """Add entity to the id, type and attribute indexes"""
+        self.entity_index[entity.id] = entity
+        if entity.id not in self._entity_rank:
+            self._entity_rank[entity.id] = self._next_rank
+            self._next_rank += 1
+        self.type_index[entity.type].add(entity.id)
+        
+        # Update attribute index
+        for attr_key, attr_value in entity.attributes.items():
+            if isinstance(attr_value, str):
+                self.attribute_index[f"{attr_key}:{attr_value}"].add(entity.id)
+        
+        self._index_trigrams(entity)
+    
+    def _index_trigrams(self, entity: Entity):
+        """(Re)index the searchable text of an entity by trigram"""
+        self._unindex_trigrams(entity.id)
+        
+        texts = [entity.name] + [
+            value for value in entity.attributes.values() if isinstance(value, str)
+        ]
+        trigrams = set()
+        for text in texts:
+            trigrams |= _trigrams(text.lower())
+        
+        for trigram in trigrams:
+            self.trigram_index[trigram].add(entity.id)
+        self._entity_trigrams[entity.id] = trigrams
+    
+    def _unindex_trigrams(self, entity_id: str):
+        """Remove an entity from the trigram index"""
+        for trigram in self._entity_trigrams.pop(entity_id, ()):
+            postings = self.trigram_index[trigram]
+            postings.discard(entity_id)
+            if not postings:
+                del self.trigram_index[trigram]
+    
     def add_relationship(self, source_id: str, target_id: str, 
                         relation_type: str, attributes: Dict = None) -> None:
         """Add relationship between entities"""
         if source_id not in self.graph or target_id not in self.graph:
             raise ValueError("Both entities must exist")
         
+        adj = self.graph.adj
+        is_new_link = source_id != target_id and target_id not in adj[source_id]
+        self._linked_nodes += sum(1 for node_id in {source_id, target_id} if not adj[node_id])
+        
         self.graph.add_edge(
             source_id, target_id,
             type=relation_type,
             **attributes or {}
         )
         
+        # Update incremental statistics
+        self._edge_count += 1
+        if is_new_link:
+            self._count_new_triangles(source_id, target_id)
+        self._union_components(source_id, target_id)
+        
         # Clear cache
+        self._mark_mutated()
         if self.redis:
             self.redis.delete(f"connections:{source_id}:{target_id}")
     
     def find_connections(self, source_id: str, target_id: str, 
                         max_depth: int = 3) -> List[List[str]]:
         """Find all paths between two entities"""
+        local_key = ("paths", source_id, target_id, max_depth)
+        cached = self._query_cache.get(local_key)
+        if cached is not None:
+            return [list(path) for path in cached]
+        
         cache_key = f"paths:{source_id}:{target_id}:{max_depth}"
         
         # Check cache
         if self.redis:
             cached = self.redis.get(cache_key)
             if cached:
-                return pickle.loads(cached)
+                paths = pickle.loads(cached)
+                self._remember_query(local_key, paths)
+                return [list(path) for path in paths]
         
         # Find paths
         try:
@@ -133,14 +260,23 @@ class KnowledgeGraph:
         # Cache result
         if self.redis and paths:
             self.redis.setex(cache_key, 300, pickle.dumps(paths))
+        self._remember_query(local_key, paths)
         
-        return paths
+        return [list(path) for path in paths]
     
     def get_entity_network(self, entity_id: str, depth: int = 2) -> Dict:
         """Get entity and its connections for visualization"""
         if entity_id not in self.graph:
             return {"nodes": [], "links": []}
         
+        cache_key = ("network", entity_id, depth)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            return {
+                "nodes": [dict(node) for node in cached["nodes"]],
+                "links": [dict(link) for link in cached["links"]]
+            }
+        
         # Get ego network (entity + neighbors within depth)
         subgraph = nx.ego_graph(self.graph, entity_id, radius=depth)
         
@@ -164,17 +300,70 @@ class KnowledgeGraph:
                 "strength": data.get('strength', 1.0)
             })
         
-        return {"nodes": nodes, "links": links}
+        network = {"nodes": nodes, "links": links}
+        self._remember_query(cache_key, network)
+        return {
+            "nodes": [dict(node) for node in nodes],
+            "links": [dict(link) for link in links]
+        }
     
-    def search_entities(self, query: str, entity_type: Optional[str] = None) -> List[Dict]:
-        """Search for entities by name or attributes"""
+    def search_entities(self, query: str, entity_type: Optional[str] = None,
+                        filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Search for entities by name or attributes
+        
+        ``filters`` maps attribute names to either an exact value or a
+        ``{"min": ..., "max": ...}`` inclusive range.
+        """
         results = []
         query_lower = query.lower()
+        filters = filters or {}
         
-        for entity_id, entity in self.entity_index.items():
+        range_filters = {
+            key: value for key, value in filters.items()
+            if isinstance(value, dict) and 'min' in value and 'max' in value
+        }
+        exact_filters = {
+            key: value for key, value in filters.items() if not isinstance(value, dict)
+        }
+        
+        # Range filters run as vectorized scans over numeric attribute columns
+        range_ids = None
+        for key, bounds in range_filters.items():
+            ids = self._filter_numeric_range(key, bounds['min'], bounds['max'])
+            if range_ids is None:
+                range_ids = ids
+            else:
+                allowed = set(ids)
+                range_ids = [entity_id for entity_id in range_ids if entity_id in allowed]
+        
+        # Any entity containing the query contains all of its trigrams, so
+        # the postings intersection is a superset of the matches
+        query_trigrams = _trigrams(query_lower)
+        if query_trigrams:
+            candidate_ids = set.intersection(
+                *(self.trigram_index.get(trigram, set()) for trigram in query_trigrams)
+            )
+            if range_ids is not None:
+                candidate_ids.intersection_update(range_ids)
+            candidates = [
+                (entity_id, self.entity_index[entity_id])
+                for entity_id in sorted(candidate_ids, key=self._entity_rank.__getitem__)
+            ]
+        elif range_ids is not None:
+            candidates = [(entity_id, self.entity_index[entity_id]) for entity_id in range_ids]
+        else:
+            candidates = self.entity_index.items()
+        
+        for entity_id, entity in candidates:
             if entity_type and entity.type != entity_type:
                 continue
             
+            if any(
+                key not in entity.attributes or entity.attributes[key] != value
+                for key, value in exact_filters.items()
+            ):
+                continue
+            
             # Search in name
             if query_lower in entity.name.lower():
                 results.append(self._entity_to_dict(entity))
@@ -188,15 +377,42 @@ class KnowledgeGraph:
         
         return results
     
+    def _filter_numeric_range(self, attribute: str, low: float, high: float) -> List[str]:
+        """Get ids of entities whose numeric ``attribute`` lies in [low, high]"""
+        ids, values = self._get_numeric_column(attribute)
+        mask = np.logical_and(values >= low, values <= high)
+        return [ids[i] for i in np.flatnonzero(mask)]
+    
+    def _get_numeric_column(self, attribute: str) -> Tuple[List[str], np.ndarray]:
+        """Get the (ids, values) column for a numeric attribute, rebuilt after mutations"""
+        column = self._numeric_columns.get(attribute)
+        if column is None:
+            ids = []
+            values = []
+            for entity_id, entity in self.entity_index.items():
+                value = entity.attributes.get(attribute)
+                if isinstance(value, (int, float)):
+                    ids.append(entity_id)
+                    values.append(value)
+            column = (ids, np.asarray(values, dtype=np.float64))
+            self._numeric_columns[attribute] = column
+        
+        return column
+    
     def _entity_to_dict(self, entity: Entity) -> Dict:
-        """Convert entity to dictionary"""
-        return {
-            "id": entity.id,
-            "type": entity.type,
-            "name": entity.name,
-            "attributes": entity.attributes,
-            "degree": self.graph.degree(entity.id)
-        }
+        """Convert entity to dictionary (memoized until the next mutation)"""
+        key = (entity.id, self._version)
+        cached = self._entity_dict_cache.get(key)
+        if cached is None:
+            cached = {
+                "id": entity.id,
+                "type": entity.type,
+                "name": entity.name,
+                "attributes": entity.attributes,
+                "degree": self.graph.degree(entity.id)
+            }
+            self._entity_dict_cache[key] = cached
+        return dict(cached)
     
     def export_graph(self, format: str = "json") -> Any:
         """Export the knowledge graph"""
@@ -280,6 +496,8 @@ class KnowledgeGraph:
             self.type_index[entity.type].add(entity_id)
         if 'attributes' in updates:
             entity.attributes.update(updates['attributes'])
+        if 'name' in updates or 'attributes' in updates:
+            self._index_trigrams(entity)
         
         # Update graph node
         node_data = self.graph.nodes[entity_id]
@@ -287,6 +505,7 @@ class KnowledgeGraph:
         node_data['updated_at'] = datetime.utcnow().isoformat()
         
         # Clear cache
+        self._mark_mutated()
         self._clear_entity_cache(entity_id)
         
         self.logger.info(f"Updated entity {entity_id}")
@@ -298,32 +517,64 @@ class KnowledgeGraph:
             raise EntityNotFoundError(entity_id)
         
         # Remove from graph
+        self._untrack_node(entity_id)
         self.graph.remove_node(entity_id)
         
         # Update indexes
         entity = self.entity_index[entity_id]
         del self.entity_index[entity_id]
+        del self._entity_rank[entity_id]
         self.type_index[entity.type].discard(entity_id)
+        self._unindex_trigrams(entity_id)
         
         # Clear cache
+        self._mark_mutated()
         self._clear_entity_cache(entity_id)
         
         self.logger.info(f"Deleted entity {entity_id}")
         return True
     
+    def clear(self) -> None:
+        """Remove all entities and relationships from the graph"""
+        for entity_id in list(self.entity_index):
+            self._clear_entity_cache(entity_id)
+        
+        self.graph.clear()
+        self.entity_index.clear()
+        self.type_index.clear()
+        self.attribute_index.clear()
+        self.trigram_index.clear()
+        self._entity_trigrams.clear()
+        self._entity_rank.clear()
+        self._next_rank = 0
+        self._edge_count = 0
+        self._linked_nodes = 0
+        self._triangles.clear()
+        self._uf_parent = {}
+        self._component_count = 0
+        self._mark_mutated()
+        
+        self.logger.info("Cleared knowledge graph")
+    
     def get_graph_stats(self) -> Dict[str, Any]:
-        """Get graph statistics"""
-        return {
-            "nodes": self.graph.number_of_nodes(),
-            "edges": self.graph.number_of_edges(),
-            "entity_types": {
-                entity_type: len(entities) 
-                for entity_type, entities in self.type_index.items()
-            },
-            "density": nx.density(self.graph),
-            "connected_components": nx.number_connected_components(self.graph),
-            "avg_clustering": self._calculate_avg_clustering(),
-        }
+        """Get graph statistics (cached until the next mutation)"""
+        if self._stats_cache is None:
+            nodes = self.graph.number_of_nodes()
+            self._stats_cache = {
+                "nodes": nodes,
+                "edges": self._edge_count,
+                "entity_types": {
+                    entity_type: len(entities) 
+                    for entity_type, entities in self.type_index.items()
+                },
+                "density": 0 if nodes <= 1 else self._edge_count / (nodes * (nodes - 1)) * 2,
+                "connected_components": self._count_components(),
+                "avg_clustering": self._calculate_avg_clustering(),
+            }
+        
+        stats = dict(self._stats_cache)
+        stats["entity_types"] = dict(stats["entity_types"])
+        return stats
     
     def get_neighbors(self, entity_id: str, depth: int = 1) -> Set[str]:
         """Get neighboring entities within specified depth"""
@@ -333,26 +584,146 @@ class KnowledgeGraph:
         if depth == 1:
             return set(self.graph.neighbors(entity_id))
         
-        # Get neighbors within specified depth
-        subgraph = nx.ego_graph(self.graph, entity_id, radius=depth)
-        return set(subgraph.nodes()) - {entity_id}
+        # Breadth-first search over the CSR adjacency, one frontier per level
+        row_ptr, col_idx, node_ids, node_index = self._get_adjacency()
+        start = node_index[entity_id]
+        visited = np.zeros(len(node_ids), dtype=bool)
+        visited[start] = True
+        frontier = np.array([start], dtype=np.int32)
+        
+        for _ in range(depth):
+            starts = row_ptr[frontier]
+            lengths = row_ptr[frontier + 1] - starts
+            total = int(lengths.sum())
+            if total == 0:
+                break
+            
+            # Gather the adjacency slices of every frontier node at once
+            offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+            neighbors = col_idx[offsets]
+            frontier = np.unique(neighbors[~visited[neighbors]])
+            if frontier.size == 0:
+                break
+            visited[frontier] = True
+        
+        visited[start] = False
+        return {node_ids[i] for i in np.flatnonzero(visited)}
+    
+    def _get_adjacency(self) -> Tuple[np.ndarray, np.ndarray, List[str], Dict[str, int]]:
+        """Get a CSR (row_ptr, col_idx) view of the graph, rebuilt after mutations
+        
+        Parallel edges collapse to a single neighbor entry.
+        """
+        if self._adjacency is None:
+            node_ids = list(self.graph.nodes())
+            node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+            adj = self.graph.adj
+            
+            row_ptr = np.zeros(len(node_ids) + 1, dtype=np.int32)
+            row_ptr[1:] = np.cumsum([len(adj[node_id]) for node_id in node_ids])
+            col_idx = np.fromiter(
+                (node_index[neighbor] for node_id in node_ids for neighbor in adj[node_id]),
+                dtype=np.int32,
+                count=int(row_ptr[-1])
+            )
+            self._adjacency = (row_ptr, col_idx, node_ids, node_index)
+        
+        return self._adjacency
     
     def _calculate_avg_clustering(self) -> float:
-        """Calculate average clustering coefficient for MultiGraph"""
-        try:
-            # Convert to simple graph for clustering calculation
-            if self.graph.is_multigraph():
-                # For MultiGraph, convert to simple graph
-                G = nx.Graph()
-                for u, v, data in self.graph.edges(data=True):
-                    G.add_edge(u, v, **data)
-                return nx.average_clustering(G)
-            else:
-                # For simple graph, calculate directly
-                return nx.average_clustering(self.graph)
-        except Exception as e:
-            self.logger.warning(f"Failed to calculate average clustering: {e}")
+        """Calculate average clustering coefficient from the per-node triangle counts
+        
+        Matches networkx on the simple graph formed by the edges: parallel
+        edges and self-loops are ignored, and nodes without edges are excluded.
+        """
+        if not self._linked_nodes:
             return 0.0
+        
+        adj = self.graph.adj
+        total = 0.0
+        for node_id, triangles in self._triangles.items():
+            if triangles:
+                degree = len(adj[node_id]) - (node_id in adj[node_id])
+                total += 2 * triangles / (degree * (degree - 1))
+        return total / self._linked_nodes
+    
+    def _track_new_node(self, node_id: str):
+        """Register a node that was just added with the incremental statistics"""
+        if self._uf_parent is not None:
+            self._uf_parent[node_id] = node_id
+            self._component_count += 1
+    
+    def _untrack_node(self, node_id: str):
+        """Remove a node that is about to be deleted from the incremental statistics"""
+        adj = self.graph.adj
+        neighbors = adj[node_id].keys() - {node_id}
+        
+        self._edge_count -= sum(len(keys) for keys in adj[node_id].values())
+        if adj[node_id]:
+            self._linked_nodes -= 1
+        
+        # Every triangle through node_id also runs through two of its neighbors
+        for neighbor in neighbors:
+            self._triangles[neighbor] -= len((adj[neighbor].keys() & neighbors) - {neighbor})
+            if adj[neighbor].keys() == {node_id}:
+                self._linked_nodes -= 1
+        self._triangles.pop(node_id, None)
+        
+        # Union-find cannot split components; rebuild on the next read
+        self._uf_parent = None
+    
+    def _count_new_triangles(self, source_id: str, target_id: str):
+        """Add the triangles closed by a new link between two distinct nodes"""
+        adj = self.graph.adj
+        common = (adj[source_id].keys() & adj[target_id].keys()) - {source_id, target_id}
+        self._triangles[source_id] += len(common)
+        self._triangles[target_id] += len(common)
+        for node_id in common:
+            self._triangles[node_id] += 1
+    
+    def _find_component(self, node_id: str) -> str:
+        """Find the union-find root of a node, halving the path as it goes"""
+        parent = self._uf_parent
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+    
+    def _union_components(self, source_id: str, target_id: str):
+        """Merge the components of two linked nodes"""
+        if self._uf_parent is None:
+            return
+        
+        source_root = self._find_component(source_id)
+        target_root = self._find_component(target_id)
+        if source_root != target_root:
+            self._uf_parent[source_root] = target_root
+            self._component_count -= 1
+    
+    def _count_components(self) -> int:
+        """Get the number of connected components, rebuilding the union-find if needed"""
+        if self._uf_parent is None:
+            self._uf_parent = {node_id: node_id for node_id in self.graph}
+            self._component_count = len(self._uf_parent)
+            for source_id, target_id in self.graph.edges():
+                self._union_components(source_id, target_id)
+        
+        return self._component_count
+    
+    def _mark_mutated(self):
+        """Bump the graph version and drop in-process memoized results"""
+        self._version += 1
+        self._entity_dict_cache.clear()
+        self._stats_cache = None
+        self._adjacency = None
+        self._numeric_columns = {}
+        self._query_cache.clear()
+    
+    def _remember_query(self, key: Tuple, value: Any):
+        """Memoize a query result until the next mutation"""
+        if len(self._query_cache) >= QUERY_CACHE_SIZE:
+            self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[key] = value
     
     def _clear_entity_cache(self, entity_id: str):
         """Clear cache entries for entity"""
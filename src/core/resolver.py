@@ -1,11 +1,19 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple, Optional, Set, Any
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Tuple, Optional, Set, Any, Callable
+from dataclasses import dataclass, field, asdict, replace
 from abc import ABC, abstractmethod
+import os
 import re
-from datetime import datetime
-from collections import defaultdict
+import sys
+import math
+import json
+import hashlib
+from datetime import datetime, date
+from collections import defaultdict, Counter
+from itertools import combinations
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 from argus.config import config
 from argus.logging import get_logger
@@ -13,6 +21,9 @@ from argus.exceptions import EntityResolutionError
 
 try:
     from fuzzywuzzy import fuzz
+    import Levenshtein
+    import jellyfish
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
     import recordlinkage
     from recordlinkage.preprocessing import clean
     from sklearn.cluster import DBSCAN
@@ -22,26 +33,65 @@ except ImportError as e:
     DEPENDENCIES_AVAILABLE = False
     MISSING_DEPS = str(e)
 
-@dataclass
+# Optional: compiles the weighted-score kernel to parallel native code
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional: runs batch blocking as SQL joins in an in-process columnar engine
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Optional: runs batch blocking as joins over Arrow-backed columns
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Smallest shard worth handing to a scoring thread
+MIN_PAIRS_PER_SHARD = 2048
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Date fields compared as numbers of days since the epoch
+DATE_FIELDS = ('dob',)
+_EPOCH = date(1970, 1, 1)
+
+# Categorical fields whose string values repeat across many entities
+INTERNED_FIELDS = ('type', 'city', 'state', 'country', 'dob')
+
+@dataclass(slots=True)
 class MatchResult:
     entity1_id: str
     entity2_id: str
     similarity_score: float
     match_type: str
     confidence: float
-    match_details: Dict[str, Any] = None
+    match_details: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
         if self.match_details is None:
             self.match_details = {}
 
-@dataclass
+@dataclass(slots=True)
 class ResolutionConfig:
     similarity_threshold: float = 0.85
     possible_match_threshold: float = 0.65
     non_match_threshold: float = 0.3
     weights: Dict[str, float] = None
     blocking_methods: List[str] = None
+    max_block_size: int = 500
+    cache_similarities: bool = False
+    similarity_cache_size: int = 10000
+    n_workers: int = -1
+    rare_token_blocking: bool = False
+    rare_token_min_idf: float = 2.0
     
     def __post_init__(self):
         if self.weights is None:
@@ -54,6 +104,117 @@ class ResolutionConfig:
         if self.blocking_methods is None:
             self.blocking_methods = ["phonetic", "exact", "range"]
 
+@dataclass
+class EntityColumns:
+    """Struct-of-arrays view of a batch of entity dicts
+    
+    Each weighted field becomes an object column of values plus boolean
+    masks, so pair features can be gathered with index arrays instead of
+    per-pair dict lookups.
+    """
+    ids: np.ndarray
+    values: Dict[str, np.ndarray]
+    present: Dict[str, np.ndarray]
+    is_string: Dict[str, np.ndarray]
+    is_number: Dict[str, np.ndarray]
+    numbers: Dict[str, np.ndarray]
+
+def _weighted_sum_numpy(sims: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Combine a (fields, pairs) similarity matrix into one weighted score per pair"""
+    out = np.zeros(sims.shape[1])
+    for f in range(sims.shape[0]):
+        out += sims[f] * weights[f]
+    return out
+
+if NUMBA_AVAILABLE:
+    # Fields are summed in order without fastmath, so scores stay identical
+    # to the NumPy fallback and to resolve_single_pair
+    @njit(parallel=True, cache=True)
+    def _weighted_sum(sims, weights):
+        out = np.zeros(sims.shape[1])
+        for i in prange(sims.shape[1]):
+            total = 0.0
+            for f in range(sims.shape[0]):
+                total += sims[f, i] * weights[f]
+            out[i] = total
+        return out
+else:
+    _weighted_sum = _weighted_sum_numpy
+
+def _epoch_days(value: Any) -> Any:
+    """Convert an ISO date string or date to days since the epoch, leaving
+    any other value unchanged"""
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value.strip())
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return (value - _EPOCH).days
+    return value
+
+def _intern_fields(entities: List[Dict]) -> List[Dict]:
+    """Shallow copies of entities with their categorical string values interned
+    
+    Repeated values then share one object, so they take memory once and
+    equal values compare by identity. The caller's dicts are not modified.
+    """
+    intern = sys.intern
+    interned = []
+    for entity in entities:
+        entity = dict(entity)
+        for field in INTERNED_FIELDS:
+            value = entity.get(field)
+            if type(value) is str:
+                entity[field] = intern(value)
+        interned.append(entity)
+    return interned
+
+def _compile_block_key_fn() -> Callable[[Dict], List[Tuple]]:
+    """Build the function that returns the blocking keys of an entity
+    
+    Entities are compared only if they share a key: either the same date of
+    birth and name initial, or the same metaphone code of the name.
+    """
+    metaphone = jellyfish.metaphone
+    
+    def block_keys(entity: Dict) -> List[Tuple]:
+        name = str(entity.get('name') or '').strip().lower()
+        dob = entity.get('dob')
+        keys = [('dob', str(dob), name[:1])] if dob else []
+        if name:
+            keys.append(('metaphone', metaphone(name)))
+        return keys
+    
+    return block_keys
+
+def _compile_combine(weights: Dict[str, float]) -> Callable[..., float]:
+    """Generate a function summing weighted field similarities for fixed weights
+    
+    The function takes one similarity per weighted field, in weight order,
+    with the weights baked in as constants. Terms are added left to right,
+    so the result matches a running sum over the weights dict; missing
+    fields are passed as 0.0 and contribute nothing.
+    """
+    params = ', '.join(f's{i}' for i in range(len(weights)))
+    terms = ''.join(f' + s{i} * {float(weight)!r}' for i, weight in enumerate(weights.values()))
+    # Non-finite weights repr as bare names
+    namespace = {'inf': math.inf, 'nan': math.nan}
+    exec(compile(f"def _combine({params}):\n    return 0.0{terms}\n", "<resolver weights>", "exec"), namespace)
+    return namespace['_combine']
+
+def _levenshtein_ratio(value1: str, value2: str) -> float:
+    """Same score as fuzz.ratio(value1, value2) / 100, computed by calling the
+    compiled Levenshtein kernel directly instead of going through fuzzywuzzy's
+    decorator and SequenceMatcher wrappers on every pair"""
+    if value1 == value2:
+        return 1.0
+    if not value1 or not value2:
+        return 0.0
+    return round(100 * Levenshtein.ratio(value1, value2)) / 100.0
+
 class SimilarityCalculator(ABC):
     """Abstract base class for similarity calculation algorithms"""
     
@@ -74,17 +235,48 @@ class StringSimilarityCalculator(SimilarityCalculator):
         """Calculate string similarity"""
         if not value1 or not value2:
             return 0.0
+        if value1 is value2 and self.method not in ("token_sort", "partial"):
+            return 1.0
         
         v1, v2 = str(value1).lower().strip(), str(value2).lower().strip()
         
-        if self.method == "jarowinkler":
-            return fuzz.ratio(v1, v2) / 100.0
-        elif self.method == "token_sort":
+        if self.method == "token_sort":
             return fuzz.token_sort_ratio(v1, v2) / 100.0
         elif self.method == "partial":
             return fuzz.partial_ratio(v1, v2) / 100.0
         else:
-            return fuzz.ratio(v1, v2) / 100.0
+            return _levenshtein_ratio(v1, v2)
+    
+    def calculate_pairs(self, values1: List[Any], values2: List[Any],
+                        score_cutoff: float = 0.0, workers: int = -1) -> np.ndarray:
+        """Calculate string similarity for aligned pairs of values in one call
+        
+        Gives the same scores as calling calculate on each pair, but the
+        default method scores every pair in a single RapidFuzz cpdist call.
+        Pairs scoring below ``score_cutoff`` may be returned as 0.0, which
+        lets the kernel stop early on clear non-matches. ``workers`` is
+        passed through to cpdist (-1 uses every core).
+        """
+        if self.method in ("token_sort", "partial"):
+            return np.array(
+                [self.calculate(v1, v2) for v1, v2 in zip(values1, values2)],
+                dtype=np.float64
+            )
+        
+        left = [str(v).lower().strip() if v else "" for v in values1]
+        right = [str(v).lower().strip() if v else "" for v in values2]
+        if not left:
+            return np.zeros(0, dtype=np.float64)
+        
+        # Raw scores below this can only round to less than score_cutoff
+        raw_cutoff = max(0.0, 100 * score_cutoff - 0.5)
+        scores = rf_process.cpdist(
+            left, right, scorer=rf_fuzz.ratio, score_cutoff=raw_cutoff,
+            dtype=np.float64, workers=workers
+        )
+        scores = np.round(scores) / 100.0
+        scores[[not (v1 and v2) for v1, v2 in zip(values1, values2)]] = 0.0
+        return scores
 
 class NumericSimilarityCalculator(SimilarityCalculator):
     """Numeric similarity using Gaussian distribution"""
@@ -99,6 +291,91 @@ class NumericSimilarityCalculator(SimilarityCalculator):
         
         diff = abs(float(value1) - float(value2))
         return np.exp(-(diff ** 2) / (2 * self.scale ** 2))
+    
+    def calculate_array(self, values1: np.ndarray, values2: np.ndarray) -> np.ndarray:
+        """Calculate numeric similarity for aligned float arrays
+        
+        Same scores as calculate on each pair, up to floating-point rounding;
+        NaN stands for a missing value and scores 0.0.
+        """
+        diff = np.abs(values1 - values2)
+        diff **= 2
+        diff /= -(2 * self.scale ** 2)
+        sims = np.exp(diff, out=diff)
+        sims[np.isnan(sims)] = 0.0
+        return sims
+
+class LSHBlocker:
+    """MinHash locality-sensitive hashing over character shingles
+    
+    Texts whose shingle sets have a Jaccard similarity above ``threshold``
+    are likely to share at least one band of their MinHash signatures. The
+    bands are split to balance false positives and false negatives at the
+    threshold.
+    """
+    
+    _PRIME = np.uint64((1 << 61) - 1)
+    _MAX_HASH = np.uint64((1 << 32) - 1)
+    
+    def __init__(self, threshold: float = 0.5, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self._optimal_bands(threshold, num_perm)
+        
+        # Universal hash functions (a * h + b) mod prime, one per permutation;
+        # below 2**31 so the products cannot overflow uint64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Choose the bands and rows per band minimizing false positive plus
+        false negative probability mass around the threshold"""
+        grid = np.linspace(0.0, 1.0, 201)
+        below, above = grid <= threshold, grid >= threshold
+        best, best_error = (1, num_perm), np.inf
+        for bands in range(1, num_perm + 1):
+            for rows in range(1, num_perm // bands + 1):
+                candidate = 1.0 - (1.0 - grid ** rows) ** bands
+                error = (candidate[below].mean() * threshold
+                         + (1.0 - candidate[above]).mean() * (1.0 - threshold))
+                if error < best_error:
+                    best, best_error = (bands, rows), error
+        return best
+    
+    def _shingles(self, text: str) -> Set[str]:
+        """Character shingles of a normalized text"""
+        text = ' '.join(text.lower().split())
+        if len(text) <= self.shingle_size:
+            return {text} if text else set()
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it has no shingles"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), 'little')
+             for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (hashes[:, None] * self._a + self._b) % self._PRIME & self._MAX_HASH
+        return permuted.min(axis=0)
+    
+    def band_keys(self, text: str) -> List[Tuple]:
+        """Bucket keys of a text, one per band"""
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        return [
+            ('lsh', band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
 
 class EntityResolver:
     """Main entity resolution class implementing the resolution pipeline"""
@@ -117,10 +394,17 @@ class EntityResolver:
                 self.config.similarity_threshold = system_config.similarity_threshold
                 self.config.weights = system_config.weights
         
+        # Weighted sum of field similarities specialized for the current
+        # weights, recompiled by update_config when they change
+        self._combine = _compile_combine(self.config.weights)
+        
         # Initialize similarity calculators
         self.string_calculator = StringSimilarityCalculator()
         self.numeric_calculator = NumericSimilarityCalculator()
         
+        # Pair results keyed by frozenset of entity ids (see cache_similarities)
+        self._pair_cache: Dict[frozenset, MatchResult] = {}
+        
         # Blocking rules by entity type
         self.blocking_rules = {
             'person': ['first_letter_of_name', 'dob_year', 'country'],
@@ -128,6 +412,8 @@ class EntityResolver:
             'location': ['country', 'type'],
             'event': ['date_year', 'country', 'type']
         }
+        self._block_key_fn = _compile_block_key_fn()
+        self._lsh_blocker = LSHBlocker(threshold=self.config.possible_match_threshold)
         
         self.logger.info("EntityResolver initialized")
     
@@ -145,7 +431,7 @@ class EntityResolver:
         similarity_matrix = self._calculate_similarities(df_clean, candidate_pairs)
         
         # Apply threshold
-        matches = similarity_matrix[similarity_matrix['overall_similarity'] > self.similarity_threshold]
+        matches = similarity_matrix[similarity_matrix['overall_similarity'] > self.config.similarity_threshold]
         
         # Cluster matches
         clusters = self._cluster_matches(matches, df_clean)
@@ -173,27 +459,99 @@ class EntityResolver:
         
         # Clean string columns
         for col in df_clean.select_dtypes(include=['object']).columns:
-            df_clean[col] = df_clean[col].apply(
-                lambda x: clean(str(x)) if pd.notnull(x) else x
-            )
+            values = df_clean[col]
+            df_clean[col] = clean(values.where(values.isna(), values.astype(str)))
         
         return df_clean
     
     def _blocking(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply blocking to reduce comparison pairs"""
-        indexer = recordlinkage.Index()
+        block_columns = []
         
         # Simple blocking on first letter of name
         if 'name' in df.columns:
             df['name_first_letter'] = df['name'].str[0].str.lower()
-            indexer.block('name_first_letter')
+            block_columns.append('name_first_letter')
         
         # Block on country if available
         if 'country' in df.columns:
-            indexer.block('country')
+            block_columns.append('country')
+        
+        # Polars is the declared blocking engine; DuckDB and recordlinkage
+        # remain as fallbacks for installs without it
+        if POLARS_AVAILABLE and block_columns:
+            return self._blocking_polars(df, block_columns)
+        if DUCKDB_AVAILABLE and block_columns:
+            return self._blocking_duckdb(df, block_columns)
+        
+        indexer = recordlinkage.Index()
+        for column in block_columns:
+            indexer.block(column)
         
         return indexer.index(df)
     
+    def _blocking_polars(self, df: pd.DataFrame, block_columns: List[str]) -> pd.MultiIndex:
+        """Generate the same pairs as recordlinkage blocking with Polars self-joins
+        
+        The blocking keys are loaded once into Polars columns (UTF-8 buffers
+        rather than per-cell Python objects); each column is joined with
+        itself and the pair sets are unioned, deduplicated and sorted in
+        Polars. Missing keys never match and each pair is (later row,
+        earlier row).
+        """
+        keys = pl.DataFrame({
+            column: pl.Series(
+                column, df[column].astype(str).where(df[column].notna(), None).tolist(), dtype=pl.Utf8
+            )
+            for column in block_columns
+        }).with_row_index('pos')
+        
+        frames = []
+        for column in block_columns:
+            side = keys.select('pos', column).drop_nulls(column)
+            frames.append(
+                side.join(side, on=column, suffix='_right')
+                .filter(pl.col('pos') > pl.col('pos_right'))
+                .select(pl.col('pos').alias('pos1'), pl.col('pos_right').alias('pos2'))
+            )
+        pairs = pl.concat(frames).unique().sort(['pos1', 'pos2'])
+        
+        return pd.MultiIndex.from_arrays([
+            df.index[pairs['pos1'].to_numpy().astype(np.intp)],
+            df.index[pairs['pos2'].to_numpy().astype(np.intp)]
+        ])
+    
+    def _blocking_duckdb(self, df: pd.DataFrame, block_columns: List[str]) -> pd.MultiIndex:
+        """Generate the same pairs as recordlinkage blocking with DuckDB self-joins
+        
+        Each blocking column becomes a hash join of the rows with itself; the
+        union keeps pairs sharing any key. Like recordlinkage, missing keys
+        never match and each pair is (later row, earlier row).
+        """
+        keys = pd.DataFrame({
+            column: df[column].astype(str).where(df[column].notna(), None).to_numpy()
+            for column in block_columns
+        })
+        keys['pos'] = np.arange(len(df), dtype=np.int64)
+        
+        joins = ' UNION '.join(
+            f'SELECT l.pos AS pos1, r.pos AS pos2 FROM keys l JOIN keys r '
+            f'ON l."{column}" = r."{column}" AND l.pos > r.pos'
+            for column in block_columns
+        )
+        
+        conn = duckdb.connect()
+        try:
+            conn.register('keys', keys)
+            pairs = conn.execute(f'{joins} ORDER BY pos1, pos2').fetchnumpy()
+        finally:
+            conn.close()
+        
+        return pd.MultiIndex.from_arrays([
+            df.index[np.asarray(pairs['pos1'], dtype=np.intp)],
+            df.index[np.asarray(pairs['pos2'], dtype=np.intp)]
+        ])
+    
     def _calculate_similarities(self, df: pd.DataFrame, candidate_pairs) -> pd.DataFrame:
         """Calculate similarity scores for candidate pairs"""
         compare = recordlinkage.Compare()
@@ -233,23 +591,22 @@ class EntityResolver:
         if len(matches) == 0:
             return {}
         
-        # Create similarity matrix for clustering
-        entity_ids = list(set(matches.index.get_level_values(0).tolist() + 
-                            matches.index.get_level_values(1).tolist()))
-        
-        # Create mapping
-        id_to_idx = {eid: idx for idx, eid in enumerate(entity_ids)}
+        # Create similarity matrix for clustering, indexing entities by
+        # their position among the sorted unique ids
+        left = matches.index.get_level_values(0)
+        right = matches.index.get_level_values(1)
+        entity_ids, positions = np.unique(
+            np.concatenate([left.to_numpy(), right.to_numpy()]), return_inverse=True
+        )
+        idx1, idx2 = positions[:len(left)], positions[len(left):]
         
-        # Initialize similarity matrix
+        # Initialize similarity matrix with self-similarity = 1 and fill in
+        # the pair scores symmetrically
         n = len(entity_ids)
-        sim_matrix = np.eye(n)  # Self-similarity = 1
-        
-        # Fill matrix with similarity scores
-        for (id1, id2), row in matches.iterrows():
-            idx1 = id_to_idx[id1]
-            idx2 = id_to_idx[id2]
-            sim_matrix[idx1, idx2] = row['overall_similarity']
-            sim_matrix[idx2, idx1] = row['overall_similarity']
+        sim_matrix = np.eye(n)
+        scores = matches['overall_similarity'].to_numpy(dtype=np.float64)
+        sim_matrix[idx1, idx2] = scores
+        sim_matrix[idx2, idx1] = scores
         
         # Apply DBSCAN clustering
         clustering = DBSCAN(eps=0.5, min_samples=2, metric='precomputed')
@@ -257,14 +614,11 @@ class EntityResolver:
         distance_matrix = 1 - sim_matrix
         labels = clustering.fit_predict(distance_matrix)
         
-        # Group entities by cluster
+        # Group entities by cluster; -1 means noise in DBSCAN
         clusters = {}
-        for entity_id, idx in id_to_idx.items():
-            cluster_id = labels[idx]
-            if cluster_id != -1:  # -1 means noise in DBSCAN
-                if cluster_id not in clusters:
-                    clusters[cluster_id] = []
-                clusters[cluster_id].append(entity_id)
+        clustered = labels != -1
+        for cluster_id, entity_id in zip(labels[clustered].tolist(), entity_ids[clustered].tolist()):
+            clusters.setdefault(cluster_id, []).append(entity_id)
         
         return clusters
     
@@ -298,74 +652,352 @@ class EntityResolver:
     
     def resolve_single_pair(self, entity1: Dict, entity2: Dict) -> MatchResult:
         """Enhanced single pair resolution with detailed results"""
+        cached = self._get_cached_pair(entity1, entity2)
+        if cached is not None:
+            return cached
+        
         try:
+            weights = self.config.weights
+            combine = self._combine
             similarity_scores = {}
-            total_score = 0.0
+            sims = [0.0] * len(weights)
             total_weight = 0.0
             
             # Calculate similarity for each field
-            for field, weight in self.config.weights.items():
+            for position, (field, weight) in enumerate(weights.items()):
                 if field in entity1 and field in entity2:
                     value1, value2 = entity1[field], entity2[field]
+                    if field in DATE_FIELDS:
+                        value1, value2 = _epoch_days(value1), _epoch_days(value2)
                     
                     if isinstance(value1, str) and isinstance(value2, str):
                         similarity = self.string_calculator.calculate(value1, value2)
-                    elif isinstance(value1, (int, float)) and isinstance(value2, (int, float)):
-                        similarity = self.numeric_calculator.calculate(value1, value2)
-                    elif value1 == value2:
-                        similarity = 1.0
                     else:
-                        similarity = 0.0
-                    
-                    similarity_scores[field] = similarity
-                    total_score += similarity * weight
+                        similarity = self._field_similarity(value1, value2)
+                    sims[position] = similarity_scores[field] = similarity
                     total_weight += weight
             
+            total_score = combine(*sims)
+            
             # Normalize score
             overall_similarity = total_score / total_weight if total_weight > 0 else 0.0
             
-            # Determine match type and confidence
-            if overall_similarity >= self.config.similarity_threshold:
-                match_type = "match"
-                confidence = min(0.9, overall_similarity)
-            elif overall_similarity >= self.config.possible_match_threshold:
-                match_type = "possible_match"
-                confidence = overall_similarity
-            else:
-                match_type = "non_match"
-                confidence = 1.0 - overall_similarity
-            
-            return MatchResult(
-                entity1_id=entity1.get('id', 'unknown'),
-                entity2_id=entity2.get('id', 'unknown'),
-                similarity_score=overall_similarity,
-                match_type=match_type,
-                confidence=confidence,
-                match_details={
-                    "field_similarities": similarity_scores,
-                    "weights_used": self.config.weights,
-                    "threshold": self.config.similarity_threshold
-                }
-            )
+            return self._cache_pair(self._match_result(entity1, entity2, similarity_scores, overall_similarity))
             
         except Exception as e:
             self.logger.error(f"Error in single pair resolution: {e}")
             raise EntityResolutionError(f"Single pair resolution failed: {e}", "resolve_single_pair")
     
+    def _get_cached_pair(self, entity1: Dict, entity2: Dict) -> Optional[MatchResult]:
+        """Look up a previously resolved pair, in either order"""
+        key = self._pair_cache_key(entity1.get('id'), entity2.get('id'))
+        if key is None:
+            return None
+        
+        cached = self._pair_cache.get(key)
+        if cached is None:
+            return None
+        return replace(cached, entity1_id=entity1['id'], entity2_id=entity2['id'])
+    
+    def _cache_pair(self, result: MatchResult) -> MatchResult:
+        """Remember a resolved pair when similarity caching is enabled
+        
+        Entries are keyed by entity id alone, so callers must clear_cache()
+        when entity contents change.
+        """
+        key = self._pair_cache_key(result.entity1_id, result.entity2_id)
+        if key is None:
+            return result
+        
+        if len(self._pair_cache) >= self.config.similarity_cache_size:
+            self._pair_cache.pop(next(iter(self._pair_cache)))
+        self._pair_cache[key] = result
+        return result
+    
+    def _pair_cache_key(self, id1: Any, id2: Any) -> Optional[frozenset]:
+        """Cache key for a pair, or None when the pair must not be cached
+        
+        Pairs without two distinct ids are never cached: a missing id, or the
+        same id on both sides, says nothing about the records' contents.
+        """
+        if not self.config.cache_similarities:
+            return None
+        if id1 in (None, 'unknown') or id2 in (None, 'unknown') or id1 == id2:
+            return None
+        return frozenset((id1, id2))
+    
+    def clear_cache(self) -> None:
+        """Forget all cached pair results"""
+        self._pair_cache.clear()
+    
+    def update_config(self, **kwargs) -> None:
+        """Update resolution settings
+        
+        Weights must be changed here rather than on the config directly, so
+        the compiled combine function is rebuilt. Cached pair results are
+        dropped since they were scored under the old settings.
+        """
+        for key, value in kwargs.items():
+            if hasattr(self.config, key):
+                setattr(self.config, key, value)
+        
+        if 'weights' in kwargs:
+            self._combine = _compile_combine(self.config.weights)
+        self.clear_cache()
+    
+    def _field_similarity(self, value1: Any, value2: Any) -> float:
+        """Similarity of two non-string field values"""
+        if isinstance(value1, (int, float)) and isinstance(value2, (int, float)):
+            return self.numeric_calculator.calculate(value1, value2)
+        elif value1 == value2:
+            return 1.0
+        else:
+            return 0.0
+    
+    def _match_result(self, entity1: Dict, entity2: Dict, similarity_scores: Dict[str, float],
+                      overall_similarity: float) -> MatchResult:
+        """Classify an overall similarity score into a MatchResult"""
+        # Determine match type and confidence
+        if overall_similarity >= self.config.similarity_threshold:
+            match_type = "match"
+            confidence = min(0.9, overall_similarity)
+        elif overall_similarity >= self.config.possible_match_threshold:
+            match_type = "possible_match"
+            confidence = overall_similarity
+        else:
+            match_type = "non_match"
+            confidence = 1.0 - overall_similarity
+        
+        return MatchResult(
+            entity1_id=entity1.get('id', 'unknown'),
+            entity2_id=entity2.get('id', 'unknown'),
+            similarity_score=overall_similarity,
+            match_type=match_type,
+            confidence=confidence,
+            match_details={
+                "field_similarities": similarity_scores,
+                "weights_used": self.config.weights,
+                "threshold": self.config.similarity_threshold
+            }
+        )
+    
+    def _resolve_pairs(self, entities: List[Dict], pairs: List[Tuple[int, int]],
+                       matches_only: bool = False) -> List[Optional[MatchResult]]:
+        """Resolve many candidate pairs at once, returning results aligned with ``pairs``
+        
+        Equivalent to resolve_single_pair on each pair, but each string field
+        is scored for all pairs in a single vectorized call. With
+        ``matches_only``, string scores too low for the pair to reach the
+        match threshold are cut off early and rows that cannot be matches may
+        be None.
+        """
+        results = [self._get_cached_pair(entities[i], entities[j]) for i, j in pairs]
+        missing = [row for row, result in enumerate(results) if result is None]
+        
+        scored = self._score_pairs_parallel(entities, [pairs[row] for row in missing], matches_only)
+        for row, result in zip(missing, scored):
+            # Only matches are built when scores were cut off early
+            if result is not None:
+                self._cache_pair(result)
+            results[row] = result
+        
+        return results
+    
+    def _n_workers(self) -> int:
+        """Number of scoring threads, with -1 meaning one per core"""
+        n_workers = self.config.n_workers
+        if n_workers is None or n_workers < 1:
+            n_workers = os.cpu_count() or 1
+        return n_workers
+    
+    def _score_pairs_parallel(self, entities: List[Dict], pairs: List[Tuple[int, int]],
+                              matches_only: bool = False) -> List[Optional[MatchResult]]:
+        """Score candidate pairs in shards on a thread pool
+        
+        The RapidFuzz kernels release the GIL, so shards score their string
+        fields concurrently. Small batches are scored on the calling thread.
+        """
+        n_shards = min(self._n_workers(), len(pairs) // MIN_PAIRS_PER_SHARD)
+        if n_shards <= 1:
+            return self._score_pairs(entities, pairs, matches_only)
+        
+        columns = self._to_soa(entities)
+        bounds = np.linspace(0, len(pairs), n_shards + 1, dtype=int)
+        with ThreadPoolExecutor(max_workers=n_shards) as executor:
+            shards = executor.map(
+                lambda shard: self._score_pairs(
+                    entities, pairs[shard[0]:shard[1]], matches_only, columns=columns, workers=1
+                ),
+                zip(bounds[:-1], bounds[1:])
+            )
+            return [result for shard in shards for result in shard]
+    
+    def _to_soa(self, entities: List[Dict]) -> EntityColumns:
+        """Convert entity dicts to columns for the weighted fields"""
+        n_entities = len(entities)
+        ids = np.empty(n_entities, dtype=object)
+        ids[:] = [entity.get('id', 'unknown') for entity in entities]
+        
+        columns = EntityColumns(ids=ids, values={}, present={}, is_string={}, is_number={}, numbers={})
+        for field in self.config.weights:
+            values = np.empty(n_entities, dtype=object)
+            if field in DATE_FIELDS:
+                # Dates are parsed once here rather than for every pair
+                values[:] = [_epoch_days(entity.get(field)) for entity in entities]
+            else:
+                values[:] = [entity.get(field) for entity in entities]
+            columns.values[field] = values
+            columns.present[field] = np.fromiter(
+                (field in entity for entity in entities), dtype=bool, count=n_entities
+            )
+            columns.is_string[field] = np.fromiter(
+                (isinstance(value, str) for value in values), dtype=bool, count=n_entities
+            )
+            columns.is_number[field] = np.fromiter(
+                (isinstance(value, (int, float)) for value in values), dtype=bool, count=n_entities
+            )
+            # Numeric values are converted to float once, NaN elsewhere
+            numbers = np.full(n_entities, np.nan)
+            numbers[columns.is_number[field]] = [float(value) for value in values[columns.is_number[field]]]
+            columns.numbers[field] = numbers
+        
+        return columns
+    
+    def _score_pairs(self, entities: List[Dict], pairs: List[Tuple[int, int]],
+                     matches_only: bool = False, columns: Optional[EntityColumns] = None,
+                     workers: int = -1) -> List[Optional[MatchResult]]:
+        """Score candidate pairs over a struct-of-arrays view of the entities
+        
+        Returns results aligned with ``pairs``. With ``matches_only``, only
+        matches are built and other rows are None; pairs whose cheap fields
+        rule out a match skip the string kernels, and string scores are cut
+        off early. Every built result carries its exact score.
+        """
+        weights = self.config.weights
+        max_total_weight = sum(weights.values())
+        n_pairs = len(pairs)
+        if n_pairs == 0:
+            return []
+        
+        if columns is None:
+            columns = self._to_soa(entities)
+        pair_index = np.asarray(pairs, dtype=np.intp)
+        left, right = pair_index[:, 0], pair_index[:, 1]
+        
+        field_sims = {}
+        field_rows = {}
+        string_rows = {}
+        upper_scores = np.zeros(n_pairs)
+        total_weights = np.zeros(n_pairs)
+        
+        # Score the cheap fields of every pair first, deferring string fields
+        for field, weight in weights.items():
+            values1, values2 = columns.values[field][left], columns.values[field][right]
+            both = columns.present[field][left] & columns.present[field][right]
+            strings = both & columns.is_string[field][left] & columns.is_string[field][right]
+            numbers = both & ~strings & columns.is_number[field][left] & columns.is_number[field][right]
+            others = both & ~strings & ~numbers
+            
+            sims = np.zeros(n_pairs)
+            sims[numbers] = self.numeric_calculator.calculate_array(
+                columns.numbers[field][left[numbers]], columns.numbers[field][right[numbers]]
+            )
+            sims[others] = np.equal(values1[others], values2[others]).astype(bool)
+            
+            upper_scores[both] += np.where(strings, 1.0, sims)[both] * weight
+            total_weights[both] += weight
+            field_sims[field] = sims
+            field_rows[field] = both
+            string_rows[field] = strings
+        
+        # When only matches are wanted, pairs that cannot reach the match
+        # threshold even with perfect string scores skip the string kernels
+        short_circuit = np.zeros(n_pairs, dtype=bool)
+        if matches_only:
+            upper_bounds = np.divide(upper_scores, total_weights, out=np.zeros(n_pairs), where=total_weights > 0)
+            short_circuit = upper_bounds < self.config.similarity_threshold
+        
+        sim_matrix = np.zeros((len(weights), n_pairs))
+        for f, (field, weight) in enumerate(weights.items()):
+            sims = field_sims[field]
+            rows = string_rows[field] & ~short_circuit
+            if rows.any():
+                # Even with every other field perfect, a pair scoring below
+                # this on the field cannot reach the match threshold
+                score_cutoff = 0.0
+                if matches_only and weight > 0:
+                    score_cutoff = max(
+                        0.0, 1.0 - max_total_weight * (1.0 - self.config.similarity_threshold) / weight
+                    )
+                sims[rows] = self.string_calculator.calculate_pairs(
+                    columns.values[field][left[rows]], columns.values[field][right[rows]],
+                    score_cutoff, workers
+                )
+            
+            sim_matrix[f, field_rows[field]] = sims[field_rows[field]]
+        
+        weight_vector = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+        total_scores = _weighted_sum(sim_matrix, weight_vector)
+        overall = np.divide(total_scores, total_weights, out=np.zeros(n_pairs), where=total_weights > 0)
+        overall[short_circuit] = 0.0
+        
+        # Only assemble result objects for the rows the caller will keep
+        build = overall >= self.config.similarity_threshold if matches_only else np.ones(n_pairs, dtype=bool)
+        results = [None] * n_pairs
+        for row in np.flatnonzero(build):
+            similarity_scores = {
+                field: float(field_sims[field][row]) for field in weights if field_rows[field][row]
+            }
+            results[row] = self._match_result(
+                entities[left[row]], entities[right[row]], similarity_scores, float(overall[row])
+            )
+        
+        return results
+    
     def find_duplicate_entities(self, entities: List[Dict], entity_type: Optional[str] = None) -> List[MatchResult]:
         """Find potential duplicate entities in a dataset"""
         try:
             # Filter by entity type if specified
             if entity_type:
                 entities = [e for e in entities if e.get('type') == entity_type]
+            entities = _intern_fields(entities)
+            
+            # Collapse records with identical content so each distinct record
+            # goes through blocking and scoring once
+            groups = defaultdict(list)
+            for idx, entity in enumerate(entities):
+                groups[self._content_key(entity)].append(idx)
+            members = list(groups.values())
+            representatives = [entities[group[0]] for group in members]
             
-            # Resolve in batch
-            matches = self.resolve_batch(entities)
+            def is_duplicate(match: Optional[MatchResult]) -> bool:
+                return match is not None and match.match_type == "match" and match.confidence >= 0.8
+            
+            found = []
+            
+            # Identical records all score like the first two of their group
+            for group in members:
+                if len(group) > 1:
+                    match = self.resolve_single_pair(entities[group[0]], entities[group[1]])
+                    if is_duplicate(match):
+                        found.extend(((i, j), match) for i, j in combinations(group, 2))
+            
+            # Only compare distinct records that share a blocking key
+            candidate_pairs = self._candidate_pairs(representatives)
+            matches = self._resolve_pairs(representatives, candidate_pairs, matches_only=True)
+            for (a, b), match in zip(candidate_pairs, matches):
+                if is_duplicate(match):
+                    found.extend(
+                        ((min(i, j), max(i, j)), match) for i in members[a] for j in members[b]
+                    )
             
-            # Filter for high-confidence matches
             duplicates = [
-                match for match in matches 
-                if match.match_type == "match" and match.confidence >= 0.8
+                replace(
+                    match,
+                    entity1_id=entities[i].get('id', 'unknown'),
+                    entity2_id=entities[j].get('id', 'unknown')
+                )
+                for (i, j), match in sorted(found, key=lambda item: item[0])
             ]
             
             self.logger.info(f"Found {len(duplicates)} duplicate pairs from {len(entities)} entities")
@@ -375,6 +1007,72 @@ class EntityResolver:
             self.logger.error(f"Error finding duplicates: {e}")
             raise EntityResolutionError(f"Duplicate detection failed: {e}", "find_duplicates")
     
+    @staticmethod
+    def _content_key(entity: Dict) -> bytes:
+        """Hash all fields of an entity except its id"""
+        payload = json.dumps(
+            {key: value for key, value in entity.items() if key != 'id'},
+            sort_keys=True, default=str
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+    
+    def _rare_address_tokens(self, entities: List[Dict]) -> List[Set[str]]:
+        """Get the address tokens of each entity that are rare in the batch
+        
+        A token is rare when its IDF across the batch's addresses is above
+        rare_token_min_idf. Tokens held by a single entity are dropped since
+        they cannot pair it with anything.
+        """
+        token_sets = [
+            set(_TOKEN_RE.findall(str(entity.get('address') or '').lower())) for entity in entities
+        ]
+        document_frequency = Counter(token for tokens in token_sets for token in tokens)
+        max_df = len(entities) / math.exp(self.config.rare_token_min_idf)
+        
+        return [
+            {token for token in tokens if 1 < document_frequency[token] <= max_df}
+            for tokens in token_sets
+        ]
+    
+    def _candidate_pairs(self, entities: List[Dict]) -> List[Tuple[int, int]]:
+        """Generate the index pairs of entities that share a blocking key"""
+        blocks = defaultdict(list)
+        block_keys = self._block_key_fn
+        for idx, entity in enumerate(entities):
+            for key in block_keys(entity):
+                blocks[key].append(idx)
+        
+        # Fuzzy name + address blocking, for matches the exact keys miss
+        if 'lsh' in self.config.blocking_methods:
+            for idx, entity in enumerate(entities):
+                text = f"{entity.get('name') or ''} {entity.get('address') or ''}"
+                for key in self._lsh_blocker.band_keys(text):
+                    blocks[key].append(idx)
+        
+        if self.config.rare_token_blocking:
+            for idx, tokens in enumerate(self._rare_address_tokens(entities)):
+                for token in tokens:
+                    blocks[('address_token', token)].append(idx)
+        
+        pairs = set()
+        max_block_size = self.config.max_block_size
+        for key, indices in blocks.items():
+            if len(indices) > max_block_size:
+                # Keep a deterministic slice of oversized blocks: the first
+                # max_block_size entities by id
+                self.logger.warning(
+                    f"Truncating block {key} from {len(indices)} to {max_block_size} entities "
+                    f"(max_block_size={max_block_size})"
+                )
+                indices = sorted(indices, key=lambda idx: (str(entities[idx].get('id', '')), idx))
+                indices = sorted(indices[:max_block_size])
+            
+            for a in range(len(indices)):
+                for b in range(a + 1, len(indices)):
+                    pairs.add((indices[a], indices[b]))
+        
+        return sorted(pairs)
+    
     def canonicalize_entity(self, entities: List[Dict]) -> Dict:
         """Create a canonical entity from a cluster of duplicates"""
         if not entities:
@@ -385,26 +1083,32 @@ class EntityResolver:
             base_entity = max(entities, key=lambda e: e.get('confidence', 0.0))
             canonical = base_entity.copy()
             
-            # Merge attributes from all entities
-            merged_attributes = defaultdict(list)
-            for entity in entities:
-                for key, value in entity.items():
-                    if key not in ['id', 'confidence', 'source']:
-                        merged_attributes[key].append(value)
+            # One column per attribute; missing or null values do not vote
+            frame = pd.DataFrame(entities, dtype=object)
+            if 'confidence' in frame.columns:
+                confidence = pd.to_numeric(frame['confidence'], errors='coerce').fillna(1.0)
+            else:
+                confidence = pd.Series(1.0, index=frame.index)
             
             # Resolve conflicts for each attribute
-            for attr, values in merged_attributes.items():
-                if len(set(str(v) for v in values)) == 1:
+            for attr in frame.columns:
+                if attr in ['id', 'confidence', 'source']:
+                    continue
+                
+                values = frame[attr][frame[attr].notna()]
+                if values.empty:
+                    continue
+                
+                if values.map(str).nunique() == 1:
                     # All values are the same
-                    canonical[attr] = values[0]
+                    canonical[attr] = values.iloc[0]
                 else:
-                    # Choose the most frequent or highest confidence value
-                    value_counts = defaultdict(int)
-                    for i, value in enumerate(values):
-                        weight = entities[i].get('confidence', 1.0)
-                        value_counts[value] += weight
-                    
-                    canonical[attr] = max(value_counts, key=value_counts.get)
+                    # Choose the value with the highest total confidence,
+                    # breaking ties by first appearance
+                    codes = pd.factorize(values, sort=False)[0]
+                    totals = np.bincount(codes, weights=confidence[values.index].to_numpy(dtype=float))
+                    winner = np.flatnonzero(codes == np.argmax(totals))[0]
+                    canonical[attr] = values.iloc[winner]
             
             # Add metadata
             canonical['sources'] = [e.get('source', 'unknown') for e in entities]
@@ -420,23 +1124,34 @@ class EntityResolver:
     def get_resolution_statistics(self, matches: List[MatchResult]) -> Dict[str, Any]:
         """Get statistics about resolution results"""
         if not matches:
-            return {"total_matches": 0}
+            return {
+                "total_matches": 0,
+                "match_types": {},
+                "avg_confidence": 0.0,
+                "avg_similarity": 0.0,
+                "high_confidence_matches": 0,
+                "possible_matches": 0,
+                "definite_matches": 0
+            }
         
-        match_types = defaultdict(int)
-        confidence_scores = []
-        similarity_scores = []
+        n_matches = len(matches)
+        confidence_scores = np.fromiter((m.confidence for m in matches), dtype=np.float64, count=n_matches)
+        similarity_scores = np.fromiter((m.similarity_score for m in matches), dtype=np.float64, count=n_matches)
         
-        for match in matches:
-            match_types[match.match_type] += 1
-            confidence_scores.append(match.confidence)
-            similarity_scores.append(match.similarity_score)
+        # Count match types in order of first appearance
+        labels, first_seen, counts = np.unique(
+            np.array([m.match_type for m in matches]), return_index=True, return_counts=True
+        )
+        match_types = {
+            str(labels[i]): int(counts[i]) for i in np.argsort(first_seen, kind="stable")
+        }
         
         return {
-            "total_matches": len(matches),
-            "match_types": dict(match_types),
-            "avg_confidence": np.mean(confidence_scores) if confidence_scores else 0.0,
-            "avg_similarity": np.mean(similarity_scores) if similarity_scores else 0.0,
-            "high_confidence_matches": len([m for m in matches if m.confidence >= 0.8]),
+            "total_matches": n_matches,
+            "match_types": match_types,
+            "avg_confidence": float(confidence_scores.mean()),
+            "avg_similarity": float(similarity_scores.mean()),
+            "high_confidence_matches": int(np.count_nonzero(confidence_scores >= 0.8)),
             "possible_matches": match_types.get("possible_match", 0),
             "definite_matches": match_types.get("match", 0)
         }
@@ -75,6 +75,11 @@ class EntityCreate(EntityBase):
         }
 
 
+class EntityBatchCreate(BaseModel):
+    """Model for creating several entities in one request"""
+    entities: List[EntityCreate] = Field(..., min_items=1, max_items=1000)
+
+
 class EntityUpdate(BaseModel):
     """Model for updating entities"""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -326,5 +331,6 @@ class BulkResponse(BaseModel):
     """Model for bulk operation responses"""
     successful: int
     failed: int
+    ids: List[str] = Field(default_factory=list)
     errors: List[Dict[str, Any]] = Field(default_factory=list)
     operation_ids: List[str] = Field(default_factory=list)
\ No newline at end of file
@@ -3,11 +3,6 @@ Enhanced visualization pages for Historical Intelligence Analysis System (HIAS)
 Integrates Plotly, PyVis, NetworkX, and mapping capabilities
 """
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
-import networkx as nx
 import requests
 import json
 from typing import Dict, List, Any, Optional
@@ -18,7 +13,6 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.core.visualization import visualization_engine
-from src.core.graph import KnowledgeGraph
 from src.core.security import security_manager
 
 class VisualizationPages:
@@ -26,7 +20,8 @@ class VisualizationPages:
     
     def __init__(self):
         self.api_base = "http://localhost:8000"
-        self.kg = KnowledgeGraph()
+        # (connect, read) timeout so a hung API cannot stall the script thread
+        self.request_timeout = (1.0, 3.0)
     
     def render_advanced_graph_explorer(self):
         """Render advanced graph exploration page"""
@@ -38,37 +33,40 @@ class VisualizationPages:
         
         # Get graph data
         try:
-            response = requests.get(f"{self.api_base}/api/entities")
+            response = requests.get(f"{self.api_base}/api/entities", timeout=self.request_timeout)
             if response.status_code == 200:
                 entities = response.json().get('entities', [])
             else:
                 entities = []
-        except:
+        except requests.RequestException:
             entities = []
         
-        # Visualization controls
-        layout = st.sidebar.selectbox(
-            "Layout Algorithm",
-            options=["Force Directed", "Circular", "Random", "Shell"],
-            index=0
-        ).lower().replace(" ", "_")
-        
-        node_size_metric = st.sidebar.selectbox(
-            "Node Size Metric",
-            options=["Degree", "Betweenness Centrality", "Fixed Size"],
-            index=0
-        ).lower().replace(" ", "_")
-        
-        # Entity type filter
-        if entities:
-            entity_types = list(set(entity.get('type', 'unknown') for entity in entities))
-            selected_types = st.sidebar.multiselect(
-                "Filter by Entity Type",
-                options=entity_types,
-                default=entity_types
-            )
-        else:
-            selected_types = []
+        # Visualization controls, batched in a form so they apply in one rerun
+        with st.sidebar.form("graph_controls"):
+            layout = st.selectbox(
+                "Layout Algorithm",
+                options=["Force Directed", "Circular", "Random", "Shell"],
+                index=0
+            ).lower().replace(" ", "_")
+            
+            node_size_metric = st.selectbox(
+                "Node Size Metric",
+                options=["Degree", "Betweenness Centrality", "Fixed Size"],
+                index=0
+            ).lower().replace(" ", "_")
+            
+            # Entity type filter
+            if entities:
+                entity_types = list(set(entity.get('type', 'unknown') for entity in entities))
+                selected_types = st.multiselect(
+                    "Filter by Entity Type",
+                    options=entity_types,
+                    default=entity_types
+                )
+            else:
+                selected_types = []
+            
+            st.form_submit_button("Apply")
         
         # Get filtered graph data
         graph_data = self._get_filtered_graph_data(entities, selected_types)
@@ -77,10 +75,15 @@ class VisualizationPages:
             st.warning("No entities found. Please import some data first.")
             return
         
-        # Create tabs for different visualizations
-        tab1, tab2, tab3 = st.tabs(["📊 Plotly Interactive", "🕸️ PyVis Network", "📈 Statistical Analysis"])
+        # Select a view; unlike st.tabs, only the selected view's body is executed
+        active_view = st.radio(
+            "View",
+            options=["📊 Plotly Interactive", "🕸️ PyVis Network", "📈 Statistical Analysis"],
+            horizontal=True,
+            key="viz_tab"
+        )
         
-        with tab1:
+        if active_view == "📊 Plotly Interactive":
             st.subheader("Interactive Plotly Graph")
             
             # Create interactive graph
@@ -95,7 +98,7 @@ class VisualizationPages:
             # Graph statistics
             self._display_graph_statistics(graph_data)
         
-        with tab2:
+        elif active_view == "🕸️ PyVis Network":
             st.subheader("PyVis Force-Directed Network")
             
             # Create PyVis graph
@@ -109,7 +112,7 @@ class VisualizationPages:
             else:
                 st.error("Failed to generate PyVis visualization")
         
-        with tab3:
+        elif active_view == "📈 Statistical Analysis":
             st.subheader("Statistical Analysis")
             
             # Create statistical charts
@@ -145,12 +148,12 @@ class VisualizationPages:
         
         # Get location data
         try:
-            response = requests.get(f"{self.api_base}/api/entities")
+            response = requests.get(f"{self.api_base}/api/entities", timeout=self.request_timeout)
             if response.status_code == 200:
                 entities = response.json().get('entities', [])
             else:
                 entities = []
-        except:
+        except requests.RequestException:
             entities = []
         
         # Filter location entities
@@ -200,32 +203,39 @@ class VisualizationPages:
         st.title("⏰ Temporal Analysis")
         st.markdown("---")
         
-        # Date range selector
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            start_date = st.date_input("Start Date")
-        
-        with col2:
-            end_date = st.date_input("End Date")
-        
-        # Analysis type selector
-        analysis_type = st.selectbox(
-            "Analysis Type",
-            options=["Entity Creation Timeline", "Relationship Formation", "Activity Heatmap"],
-            index=0
-        )
+        # Filters are batched in a form so the page reruns once per "Apply"
+        # rather than on every individual widget change
+        with st.form("temporal_filters"):
+            # Date range selector
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                start_date = st.date_input("Start Date")
+            
+            with col2:
+                end_date = st.date_input("End Date")
+            
+            # Analysis type selector
+            analysis_type = st.selectbox(
+                "Analysis Type",
+                options=["Entity Creation Timeline", "Relationship Formation", "Activity Heatmap"],
+                index=0
+            )
+            
+            st.form_submit_button("Apply")
         
         # Get temporal data
         try:
-            response = requests.get(f"{self.api_base}/api/entities")
+            response = requests.get(f"{self.api_base}/api/entities", timeout=self.request_timeout)
             if response.status_code == 200:
                 entities = response.json().get('entities', [])
             else:
                 entities = []
-        except:
+        except requests.RequestException:
             entities = []
         
+        import pandas as pd
+        
         # Filter by date range
         filtered_entities = []
         for entity in entities:
@@ -277,12 +287,12 @@ class VisualizationPages:
         
         # Get graph statistics
         try:
-            response = requests.get(f"{self.api_base}/api/stats")
+            response = requests.get(f"{self.api_base}/api/stats", timeout=self.request_timeout)
             if response.status_code == 200:
                 stats = response.json()
             else:
                 stats = {}
-        except:
+        except requests.RequestException:
             stats = {}
         
         if not stats:
@@ -345,7 +355,10 @@ class VisualizationPages:
             
             # Entity type distribution
             try:
-                response = requests.get(f"{self.api_base}/api/entities")
+                response = requests.get(f"{self.api_base}/api/entities", timeout=self.request_timeout)
+            except requests.RequestException:
+                st.error("Error connecting to API")
+            else:
                 if response.status_code == 200:
                     entities = response.json().get('entities', [])
                     
@@ -354,16 +367,15 @@ class VisualizationPages:
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.error("Failed to fetch entity data")
-            except:
-                st.error("Error connecting to API")
     
     def _get_filtered_graph_data(self, entities: List[Dict], selected_types: List[str]) -> Dict[str, Any]:
         """Get filtered graph data based on selected entity types"""
         
         # Filter entities
+        wanted_types = set(selected_types)
         filtered_entities = [
             entity for entity in entities 
-            if entity.get('type') in selected_types
+            if entity.get('type') in wanted_types
         ]
         
         # Get relationships (placeholder - would get from API)
@@ -377,12 +389,12 @@ class VisualizationPages:
     def _get_graph_data(self) -> Dict[str, Any]:
         """Get complete graph data"""
         try:
-            response = requests.get(f"{self.api_base}/api/entities")
+            response = requests.get(f"{self.api_base}/api/entities", timeout=self.request_timeout)
             if response.status_code == 200:
                 entities = response.json().get('entities', [])
             else:
                 entities = []
-        except:
+        except requests.RequestException:
             entities = []
         
         return {
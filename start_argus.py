@@ -7,12 +7,34 @@ import sys
 import os
 import subprocess
 import time
+import re
 import signal
+import socket
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import psutil
 import requests
 
+# Emoji replacements for console output; '❤️' spans two code points, so a
+# single compiled alternation is used rather than a str.translate table
+EMOJI_REPLACEMENTS = {
+    '🚀': '[STARTUP]',
+    '🔧': '[API]',
+    '📊': '[UI]',
+    '✅': '[OK]',
+    '❌': '[FAIL]',
+    '🌐': '[WEB]',
+    '📚': '[DOCS]',
+    '❤️': '[HEALTH]',
+    '🎯': '[STATUS]',
+    '🎉': '[SUCCESS]',
+    '🛑': '[STOP]',
+    '👋': '[BYE]',
+    '📋': '[INFO]'
+}
+EMOJI_PATTERN = re.compile('|'.join(re.escape(emoji) for emoji in EMOJI_REPLACEMENTS))
+
 # Configure logging
 def setup_logging():
     """Setup comprehensive logging for error tracing"""
@@ -26,25 +48,7 @@ def setup_logging():
         def format(self, record):
             # Replace emojis with text equivalents for console output
             msg = super().format(record)
-            # Replace common emojis with text
-            emoji_replacements = {
-                '🚀': '[STARTUP]',
-                '🔧': '[API]',
-                '📊': '[UI]',
-                '✅': '[OK]',
-                '❌': '[FAIL]',
-                '🌐': '[WEB]',
-                '📚': '[DOCS]',
-                '❤️': '[HEALTH]',
-                '🎯': '[STATUS]',
-                '🎉': '[SUCCESS]',
-                '🛑': '[STOP]',
-                '👋': '[BYE]',
-                '📋': '[INFO]'
-            }
-            for emoji, replacement in emoji_replacements.items():
-                msg = msg.replace(emoji, replacement)
-            return msg
+            return EMOJI_PATTERN.sub(lambda m: EMOJI_REPLACEMENTS[m.group(0)], msg)
     
     # Setup file handler (keeps emojis)
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
@@ -76,22 +80,22 @@ def signal_handler(signum, frame):
         sys.exit(0)
 
 def check_port_available(port, description):
-    """Check if a port is available"""
+    """Check if a port is available by attempting to bind it"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
-        for conn in psutil.net_connections():
-            if conn.laddr.port == port:
-                logger.warning(f"Port {port} is already in use by {conn.pid}")
-                return False
-        return True
-    except Exception as e:
-        logger.debug(f"Port check error: {e}")
+        sock.bind(('127.0.0.1', port))
         return True
+    except OSError as e:
+        logger.warning(f"Port {port} for {description} is already in use: {e}")
+        return False
+    finally:
+        sock.close()
 
 def kill_process_on_port(port):
     """Kill process using a specific port"""
     try:
-        for conn in psutil.net_connections():
-            if conn.laddr.port == port and conn.pid:
+        for conn in psutil.net_connections(kind='tcp'):
+            if conn.pid and conn.laddr and conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
                 logger.info(f"Terminating process {conn.pid} using port {port}")
                 psutil.Process(conn.pid).terminate()
                 time.sleep(2)
@@ -101,19 +105,48 @@ def kill_process_on_port(port):
         logger.error(f"Failed to kill process on port {port}: {e}")
         return False
 
-def check_service(url, description, timeout=5):
+def check_service(url, description, timeout=(1.0, 3.0)):
     """Check if a service is responding"""
     try:
-        import requests
         logger.debug(f"Checking {description} at {url}")
         response = requests.get(url, timeout=timeout)
         success = response.status_code == 200
         logger.debug(f"{description} check: {'✅ Success' if success else '❌ Failed'} (Status: {response.status_code})")
         return success
-    except Exception as e:
-        logger.error(f"{description} check failed: {e}")
-        # Don't return False for connection errors - service might be starting
-        return True
+    except requests.RequestException as e:
+        logger.debug(f"{description} check failed: {e}")
+        return False
+
+def wait_for_service(url, description, timeout=15.0, interval=0.5):
+    """Poll a service until it responds or the timeout runs out"""
+    start = time.monotonic()
+    deadline = start + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if check_service(url, description, timeout=min(1.0, remaining)):
+            return True
+        time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+    logger.error(f"{description} did not become healthy after {time.monotonic() - start:.1f}s")
+    return False
+
+def open_service_log(name):
+    """Open an append-mode log file that a service subprocess writes its output to"""
+    log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{name}.log")
+    return open(log_path, 'ab', buffering=0), log_path
+
+def read_log_tail(log_path, max_bytes=4096):
+    """Read the end of a service log for error reporting"""
+    try:
+        with open(log_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - max_bytes))
+            return f.read().decode(errors='replace')
+    except OSError:
+        return 'None'
 
 def start_api():
     """Start API server with enhanced error logging"""
@@ -136,7 +169,11 @@ def start_api():
         ]
         
         logger.debug(f"API command: {' '.join(api_cmd)}")
-        process = subprocess.Popen(api_cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Send output to a log file rather than an unread pipe, which would
+        # block the child once the pipe buffer fills
+        log_file, log_path = open_service_log('api')
+        process = subprocess.Popen(api_cmd, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        log_file.close()
         
         # Wait a moment to check if process started successfully
         time.sleep(2)
@@ -146,10 +183,8 @@ def start_api():
             return process
         else:
             # Process died immediately, get error output
-            stdout, stderr = process.communicate()
             logger.error(f"API Server failed to start immediately")
-            logger.error(f"STDOUT: {stdout.decode() if stdout else 'None'}")
-            logger.error(f"STDERR: {stderr.decode() if stderr else 'None'}")
+            logger.error(f"Output ({log_path}): {read_log_tail(log_path)}")
             return None
             
     except Exception as e:
@@ -180,7 +215,9 @@ def start_ui():
         ]
         
         logger.debug(f"UI command: {' '.join(ui_cmd)}")
-        process = subprocess.Popen(ui_cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        log_file, log_path = open_service_log('ui')
+        process = subprocess.Popen(ui_cmd, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        log_file.close()
         
         # Wait a moment to check if process started successfully
         time.sleep(3)
@@ -190,10 +227,8 @@ def start_ui():
             return process
         else:
             # Process died immediately, get error output
-            stdout, stderr = process.communicate()
             logger.error(f"Streamlit UI failed to start immediately")
-            logger.error(f"STDOUT: {stdout.decode() if stdout else 'None'}")
-            logger.error(f"STDERR: {stderr.decode() if stderr else 'None'}")
+            logger.error(f"Output ({log_path}): {read_log_tail(log_path)}")
             return None
             
     except Exception as e:
@@ -209,23 +244,23 @@ def main():
     # Set up signal handler
     signal.signal(signal.SIGINT, signal_handler)
     
-    # Start services
+    # Start services concurrently so their startup waits overlap
     logger.info("Starting services...")
-    api_process = start_api()
-    ui_process = start_ui()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_future = executor.submit(start_api)
+        ui_future = executor.submit(start_ui)
+        api_process, ui_process = api_future.result(), ui_future.result()
     
     if not api_process or not ui_process:
         logger.error("❌ Failed to start services")
         return 1
     
-    # Wait for services to start
+    # Poll both services until they respond
     logger.info("Waiting for services to initialize...")
-    time.sleep(3)
-    
-    # Check service status
-    logger.info("Checking service health...")
-    api_healthy = check_service("http://localhost:8000/health", "API Server")
-    ui_healthy = check_service("http://localhost:8501", "Streamlit UI")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_future = executor.submit(wait_for_service, "http://localhost:8000/health", "API Server")
+        ui_future = executor.submit(wait_for_service, "http://localhost:8501", "Streamlit UI")
+        api_healthy, ui_healthy = api_future.result(), ui_future.result()
     
     print("\n🎯 Services Status:")
     print(f"   🔧 API Server: {'✅ Running' if api_healthy else '❌ Failed'}")
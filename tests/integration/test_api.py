@@ -3,41 +3,83 @@
 Integration tests for API endpoints
 """
 import pytest
+import pytest_asyncio
+import asyncio
 import json
+import httpx
 from fastapi.testclient import TestClient
 from unittest.mock import patch
 import sys
 import os
+from types import MappingProxyType
+from contextlib import asynccontextmanager
 
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from src.api.server import app
+from src.api.server import app, kg
 from src.core.graph import Entity
 
+# Shared entity payload; merge with ``|`` rather than mutating
+BASE_ENTITY = MappingProxyType({
+    "type": "person",
+    "name": "John Doe",
+    "attributes": {
+        "age": 30,
+        "city": "New York",
+        "email": "john.doe@example.com"
+    },
+    "source": "test",
+    "confidence": 0.9
+})
+
+
+@asynccontextmanager
+async def _noop_lifespan(app):
+    """Lifespan that skips the server's startup and shutdown handlers"""
+    yield
+
 
 class TestAPIIntegration:
     """Test cases for API integration"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def client(self):
-        """Create test client"""
-        return TestClient(app)
+        """Create a test client shared by all tests in the class
+        
+        The client stays open for the whole class so requests reuse one
+        portal. The startup handlers (demo users, alert monitoring) are not
+        needed here, so the lifespan is a no-op while the client is open;
+        a test that needs them should open its own ``TestClient(app)``.
+        """
+        original_lifespan = app.router.lifespan_context
+        app.router.lifespan_context = _noop_lifespan
+        try:
+            with TestClient(app) as client:
+                yield client
+        finally:
+            app.router.lifespan_context = original_lifespan
     
-    @pytest.fixture
-    def sample_entity_data(self):
-        """Sample entity data for testing"""
-        return {
-            "type": "person",
-            "name": "John Doe",
-            "attributes": {
-                "age": 30,
-                "city": "New York",
-                "email": "john.doe@example.com"
-            },
-            "source": "test",
-            "confidence": 0.9
-        }
+    @pytest_asyncio.fixture(scope="class", loop_scope="session")
+    async def aclient(self):
+        """Create an async client so independent requests can run concurrently
+        
+        The client and every async test share the session event loop, so no
+        loop is built or torn down per test.
+        """
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    
+    @pytest.fixture(autouse=True)
+    def reset_graph(self):
+        """Start each test with an empty knowledge graph
+        
+        Under pytest-xdist each worker process imports its own server
+        module, so every worker already has an isolated graph.
+        """
+        kg.clear()
+        yield
     
     def test_root_endpoint(self, client):
         """Test root endpoint"""
@@ -60,32 +102,49 @@ class TestAPIIntegration:
         assert "timestamp" in data
         assert data["version"] == "0.1.0"
     
-    def test_create_entity(self, client, sample_entity_data):
+    def test_create_entity(self, client):
         """Test creating an entity"""
-        response = client.post("/api/entities", json=sample_entity_data)
+        response = client.post("/api/entities", json=dict(BASE_ENTITY))
         assert response.status_code == 200
         
         data = response.json()
         assert "id" in data
-        assert data["type"] == sample_entity_data["type"]
-        assert data["name"] == sample_entity_data["name"]
-        assert data["source"] == sample_entity_data["source"]
-        assert data["confidence"] == sample_entity_data["confidence"]
+        assert data["type"] == BASE_ENTITY["type"]
+        assert data["name"] == BASE_ENTITY["name"]
+        assert data["source"] == BASE_ENTITY["source"]
+        assert data["confidence"] == BASE_ENTITY["confidence"]
     
-    def test_create_entity_with_id(self, client, sample_entity_data):
+    def test_create_entity_with_id(self, client):
         """Test creating an entity with specific ID"""
-        sample_entity_data["id"] = "test_entity_123"
+        entity_data = BASE_ENTITY | {"id": "test_entity_123"}
         
-        response = client.post("/api/entities", json=sample_entity_data)
+        response = client.post("/api/entities", json=entity_data)
         assert response.status_code == 200
         
         data = response.json()
         assert data["id"] == "test_entity_123"
     
-    def test_get_entity(self, client, sample_entity_data):
+    def test_create_entities_batch(self, client):
+        """Test creating several entities in one request"""
+        batch = {
+            "entities": [
+                BASE_ENTITY | {"name": f"Person {i+1}"} for i in range(3)
+            ]
+        }
+        
+        response = client.post("/api/entities/batch", json=batch)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["successful"] == 3
+        assert data["failed"] == 0
+        assert len(data["ids"]) == 3
+        assert all(entity_id in kg.entity_index for entity_id in data["ids"])
+    
+    def test_get_entity(self, client):
         """Test retrieving an entity"""
         # Create entity first
-        create_response = client.post("/api/entities", json=sample_entity_data)
+        create_response = client.post("/api/entities", json=dict(BASE_ENTITY))
         entity_id = create_response.json()["id"]
         
         # Get entity
@@ -94,8 +153,8 @@ class TestAPIIntegration:
         
         data = response.json()
         assert data["id"] == entity_id
-        assert data["name"] == sample_entity_data["name"]
-        assert data["type"] == sample_entity_data["type"]
+        assert data["name"] == BASE_ENTITY["name"]
+        assert data["type"] == BASE_ENTITY["type"]
     
     def test_get_nonexistent_entity(self, client):
         """Test retrieving a non-existent entity"""
@@ -105,10 +164,10 @@ class TestAPIIntegration:
         data = response.json()
         assert "detail" in data
     
-    def test_update_entity(self, client, sample_entity_data):
+    def test_update_entity(self, client):
         """Test updating an entity"""
         # Create entity first
-        create_response = client.post("/api/entities", json=sample_entity_data)
+        create_response = client.post("/api/entities", json=dict(BASE_ENTITY))
         entity_id = create_response.json()["id"]
         
         # Update entity
@@ -133,10 +192,10 @@ class TestAPIIntegration:
         response = client.put("/api/entities/nonexistent", json=update_data)
         assert response.status_code == 404
     
-    def test_delete_entity(self, client, sample_entity_data):
+    def test_delete_entity(self, client):
         """Test deleting an entity"""
         # Create entity first
-        create_response = client.post("/api/entities", json=sample_entity_data)
+        create_response = client.post("/api/entities", json=dict(BASE_ENTITY))
         entity_id = create_response.json()["id"]
         
         # Delete entity
@@ -156,17 +215,16 @@ class TestAPIIntegration:
         response = client.delete("/api/entities/nonexistent")
         assert response.status_code == 404
     
-    def test_list_entities(self, client, sample_entity_data):
+    def test_list_entities(self, client):
         """Test listing entities"""
         # Create multiple entities
-        entities = []
-        for i in range(3):
-            entity_data = sample_entity_data.copy()
-            entity_data["name"] = f"Person {i+1}"
-            entity_data["attributes"]["age"] = 20 + i
-            
-            response = client.post("/api/entities", json=entity_data)
-            entities.append(response.json())
+        client.post("/api/entities/batch", json={"entities": [
+            BASE_ENTITY | {
+                "name": f"Person {i+1}",
+                "attributes": BASE_ENTITY["attributes"] | {"age": 20 + i}
+            }
+            for i in range(3)
+        ]})
         
         # List entities
         response = client.get("/api/entities")
@@ -179,10 +237,11 @@ class TestAPIIntegration:
         assert "pages" in data
         assert len(data["items"]) <= 50  # Default limit
     
-    def test_list_entities_with_filters(self, client, sample_entity_data):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_list_entities_with_filters(self, aclient):
         """Test listing entities with filters"""
         # Create entities of different types
-        person_data = sample_entity_data.copy()
+        person_data = dict(BASE_ENTITY)
         org_data = {
             "type": "organization",
             "name": "Tech Corp",
@@ -191,28 +250,31 @@ class TestAPIIntegration:
             "confidence": 1.0
         }
         
-        client.post("/api/entities", json=person_data)
-        client.post("/api/entities", json=org_data)
+        await asyncio.gather(
+            aclient.post("/api/entities", json=person_data),
+            aclient.post("/api/entities", json=org_data)
+        )
         
         # Filter by type
-        response = client.get("/api/entities?entity_type=person")
+        response = await aclient.get("/api/entities?entity_type=person")
         assert response.status_code == 200
         
         data = response.json()
         assert len(data["items"]) == 1
         assert data["items"][0]["type"] == "person"
     
-    def test_create_relationship(self, client, sample_entity_data):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_create_relationship(self, aclient):
         """Test creating a relationship"""
         # Create two entities first
-        entity1_data = sample_entity_data.copy()
-        entity1_data["name"] = "Alice"
+        entity1_data = BASE_ENTITY | {"name": "Alice"}
         
-        entity2_data = sample_entity_data.copy()
-        entity2_data["name"] = "Bob"
+        entity2_data = BASE_ENTITY | {"name": "Bob"}
         
-        response1 = client.post("/api/entities", json=entity1_data)
-        response2 = client.post("/api/entities", json=entity2_data)
+        response1, response2 = await asyncio.gather(
+            aclient.post("/api/entities", json=entity1_data),
+            aclient.post("/api/entities", json=entity2_data)
+        )
         
         entity1_id = response1.json()["id"]
         entity2_id = response2.json()["id"]
@@ -226,7 +288,7 @@ class TestAPIIntegration:
             "strength": 0.8
         }
         
-        response = client.post("/api/relationships", json=relationship_data)
+        response = await aclient.post("/api/relationships", json=relationship_data)
         assert response.status_code == 200
         
         data = response.json()
@@ -247,17 +309,18 @@ class TestAPIIntegration:
         response = client.post("/api/relationships", json=relationship_data)
         assert response.status_code == 400
     
-    def test_get_relationships(self, client, sample_entity_data):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_relationships(self, aclient):
         """Test getting relationships"""
         # Create entities and relationship
-        entity1_data = sample_entity_data.copy()
-        entity1_data["name"] = "Alice"
+        entity1_data = BASE_ENTITY | {"name": "Alice"}
         
-        entity2_data = sample_entity_data.copy()
-        entity2_data["name"] = "Bob"
+        entity2_data = BASE_ENTITY | {"name": "Bob"}
         
-        response1 = client.post("/api/entities", json=entity1_data)
-        response2 = client.post("/api/entities", json=entity2_data)
+        response1, response2 = await asyncio.gather(
+            aclient.post("/api/entities", json=entity1_data),
+            aclient.post("/api/entities", json=entity2_data)
+        )
         
         entity1_id = response1.json()["id"]
         entity2_id = response2.json()["id"]
@@ -269,10 +332,10 @@ class TestAPIIntegration:
             "type": "knows"
         }
         
-        client.post("/api/relationships", json=relationship_data)
+        await aclient.post("/api/relationships", json=relationship_data)
         
         # Get relationships
-        response = client.get("/api/relationships")
+        response = await aclient.get("/api/relationships")
         assert response.status_code == 200
         
         data = response.json()
@@ -280,31 +343,31 @@ class TestAPIIntegration:
         assert "count" in data
         assert len(data["relationships"]) >= 1
     
-    def test_get_entity_network(self, client, sample_entity_data):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_entity_network(self, aclient):
         """Test getting entity network"""
         # Create entities and relationships
-        entities = []
-        for i in range(3):
-            entity_data = sample_entity_data.copy()
-            entity_data["name"] = f"Person {i+1}"
-            response = client.post("/api/entities", json=entity_data)
-            entities.append(response.json())
+        response = await aclient.post("/api/entities/batch", json={"entities": [
+            BASE_ENTITY | {"name": f"Person {i+1}"} for i in range(3)
+        ]})
+        entity_ids = response.json()["ids"]
         
         # Create relationships
-        client.post("/api/relationships", json={
-            "source_id": entities[0]["id"],
-            "target_id": entities[1]["id"],
-            "type": "knows"
-        })
-        
-        client.post("/api/relationships", json={
-            "source_id": entities[1]["id"],
-            "target_id": entities[2]["id"],
-            "type": "works_with"
-        })
+        await asyncio.gather(
+            aclient.post("/api/relationships", json={
+                "source_id": entity_ids[0],
+                "target_id": entity_ids[1],
+                "type": "knows"
+            }),
+            aclient.post("/api/relationships", json={
+                "source_id": entity_ids[1],
+                "target_id": entity_ids[2],
+                "type": "works_with"
+            })
+        )
         
         # Get network for middle entity
-        response = client.get(f"/api/graph/{entities[1]['id']}?depth=2")
+        response = await aclient.get(f"/api/graph/{entity_ids[1]}?depth=2")
         assert response.status_code == 200
         
         data = response.json()
@@ -319,17 +382,18 @@ class TestAPIIntegration:
         response = client.get("/api/graph/nonexistent")
         assert response.status_code == 404
     
-    def test_search_entities(self, client, sample_entity_data):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_search_entities(self, aclient):
         """Test searching entities"""
         # Create entities
-        entity1_data = sample_entity_data.copy()
-        entity1_data["name"] = "Alice Smith"
+        entity1_data = BASE_ENTITY | {"name": "Alice Smith"}
         
-        entity2_data = sample_entity_data.copy()
-        entity2_data["name"] = "Bob Jones"
+        entity2_data = BASE_ENTITY | {"name": "Bob Jones"}
         
-        client.post("/api/entities", json=entity1_data)
-        client.post("/api/entities", json=entity2_data)
+        await asyncio.gather(
+            aclient.post("/api/entities", json=entity1_data),
+            aclient.post("/api/entities", json=entity2_data)
+        )
         
         # Search
         search_data = {
@@ -337,7 +401,7 @@ class TestAPIIntegration:
             "limit": 10
         }
         
-        response = client.post("/api/search", json=search_data)
+        response = await aclient.post("/api/search", json=search_data)
         assert response.status_code == 200
         
         data = response.json()
@@ -349,19 +413,19 @@ class TestAPIIntegration:
         found_alice = any("Alice" in item.get("name", "") for item in data["items"])
         assert found_alice
     
-    def test_search_entities_with_filters(self, client, sample_entity_data):
+    def test_search_entities_with_filters(self, client):
         """Test searching entities with filters"""
         # Create entities with different attributes
-        entity1_data = sample_entity_data.copy()
-        entity1_data["name"] = "Alice"
-        entity1_data["attributes"]["age"] = 25
-        
-        entity2_data = sample_entity_data.copy()
-        entity2_data["name"] = "Bob"
-        entity2_data["attributes"]["age"] = 35
-        
-        client.post("/api/entities", json=entity1_data)
-        client.post("/api/entities", json=entity2_data)
+        client.post("/api/entities/batch", json={"entities": [
+            BASE_ENTITY | {
+                "name": "Alice",
+                "attributes": BASE_ENTITY["attributes"] | {"age": 25}
+            },
+            BASE_ENTITY | {
+                "name": "Bob",
+                "attributes": BASE_ENTITY["attributes"] | {"age": 35}
+            }
+        ]})
         
         # Search with age filter
         search_data = {
@@ -408,13 +472,12 @@ class TestAPIIntegration:
         # Should find at least one match between the two John Smith entities
         assert len(data) >= 0
     
-    def test_get_stats(self, client, sample_entity_data):
+    def test_get_stats(self, client):
         """Test getting graph statistics"""
-        # Create some entities and relationships
-        for i in range(3):
-            entity_data = sample_entity_data.copy()
-            entity_data["name"] = f"Person {i+1}"
-            client.post("/api/entities", json=entity_data)
+        # Create some entities
+        client.post("/api/entities/batch", json={"entities": [
+            BASE_ENTITY | {"name": f"Person {i+1}"} for i in range(3)
+        ]})
         
         # Get stats
         response = client.get("/api/stats")
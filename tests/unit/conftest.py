@@ -0,0 +1,82 @@
+"""
+Shared fixtures for unit tests
+"""
+import os
+import sys
+import types
+
+import pytest
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+
+class FakeRedis:
+    """Stand-in for redis.Redis that accepts every call and caches nothing"""
+
+    def __init__(self, *args, **kwargs):
+        self.ping_calls = 0
+
+    def ping(self):
+        self.ping_calls += 1
+        return True
+
+    def get(self, key):
+        return None
+
+    def setex(self, key, ttl, value):
+        return True
+
+    def keys(self, pattern):
+        return []
+
+    def delete(self, *keys):
+        return 0
+
+
+# Installed before any test module imports the graph, so KnowledgeGraph's
+# lazy ``import redis`` never loads the real client
+_fake_redis = types.ModuleType("redis")
+_fake_redis.Redis = FakeRedis
+sys.modules["redis"] = _fake_redis
+
+from src.core.graph import Entity
+
+
+class EntityPool:
+    """Hands out reused Entity instances to test fixtures
+
+    Entities must only be released once no KnowledgeGraph holds them.
+    """
+
+    def __init__(self):
+        self._free = []
+
+    def acquire(self, id, type, name, attributes, source, confidence=1.0):
+        """Take an entity from the pool, or allocate one if the pool is empty"""
+        if not self._free:
+            return Entity(id, type, name, attributes, source, confidence)
+        entity = self._free.pop()
+        entity.id = id
+        entity.type = type
+        entity.name = name
+        entity.attributes = attributes
+        entity.source = source
+        entity.confidence = confidence
+        return entity
+
+    def release(self, entity):
+        """Reset an entity and return it to the pool"""
+        entity.attributes = {}
+        self._free.append(entity)
+
+    def clear(self):
+        self._free.clear()
+
+
+@pytest.fixture(scope="session")
+def entity_pool():
+    """Session-wide Entity pool, drained once the session is finished"""
+    pool = EntityPool()
+    yield pool
+    pool.clear()
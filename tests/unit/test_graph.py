@@ -18,15 +18,22 @@ from argus.exceptions import EntityNotFoundError, GraphError
 class TestKnowledgeGraph:
     """Test cases for KnowledgeGraph class"""
     
-    @pytest.fixture
-    def kg(self):
-        """Create a test knowledge graph instance"""
+    @pytest.fixture(scope="class")
+    def shared_kg(self):
+        """Create one knowledge graph instance for the whole class"""
         return KnowledgeGraph(use_cache=False)
     
     @pytest.fixture
-    def sample_entity(self):
+    def kg(self, shared_kg):
+        """Provide the shared knowledge graph, emptied for each test"""
+        shared_kg.clear()
+        yield shared_kg
+        shared_kg.clear()
+    
+    @pytest.fixture
+    def sample_entity(self, kg, entity_pool):
         """Create a sample entity for testing"""
-        return Entity(
+        entity = entity_pool.acquire(
             id="test_entity_1",
             type="person",
             name="John Doe",
@@ -34,12 +41,16 @@ class TestKnowledgeGraph:
             source="test",
             confidence=0.9
         )
+        yield entity
+        # The shared graph may still hold the entity
+        kg.clear()
+        entity_pool.release(entity)
     
     @pytest.fixture
-    def sample_entities(self):
+    def sample_entities(self, kg, entity_pool):
         """Create multiple sample entities"""
-        return [
-            Entity(
+        entities = [
+            entity_pool.acquire(
                 id="person_1",
                 type="person",
                 name="Alice Smith",
@@ -47,7 +58,7 @@ class TestKnowledgeGraph:
                 source="test",
                 confidence=0.8
             ),
-            Entity(
+            entity_pool.acquire(
                 id="person_2", 
                 type="person",
                 name="Bob Jones",
@@ -55,7 +66,7 @@ class TestKnowledgeGraph:
                 source="test",
                 confidence=0.9
             ),
-            Entity(
+            entity_pool.acquire(
                 id="company_1",
                 type="organization",
                 name="Tech Corp",
@@ -64,6 +75,11 @@ class TestKnowledgeGraph:
                 confidence=1.0
             )
         ]
+        yield entities
+        # The shared graph may still hold the entities
+        kg.clear()
+        for entity in entities:
+            entity_pool.release(entity)
     
     def test_init(self, kg):
         """Test KnowledgeGraph initialization"""
@@ -91,6 +107,17 @@ class TestKnowledgeGraph:
         assert node_data['confidence'] == sample_entity.confidence
         assert 'created_at' in node_data
     
+    def test_add_entities(self, kg, sample_entities):
+        """Test adding several entities at once"""
+        entity_ids = kg.add_entities(sample_entities)
+        
+        assert entity_ids == ["person_1", "person_2", "company_1"]
+        assert kg.graph.number_of_nodes() == 3
+        assert kg.type_index["person"] == {"person_1", "person_2"}
+        assert kg.type_index["organization"] == {"company_1"}
+        assert "person_2" in kg.attribute_index["city:New York"]
+        assert 'created_at' in kg.graph.nodes["company_1"]
+    
     def test_add_duplicate_entity(self, kg, sample_entity):
         """Test adding a duplicate entity"""
         kg.add_entity(sample_entity)
@@ -143,6 +170,20 @@ class TestKnowledgeGraph:
         assert entity_id not in kg.graph.nodes
         assert entity_id not in kg.type_index[sample_entity.type]
     
+    def test_entity_pool_reuse(self, entity_pool):
+        """Test released entities are reset and handed out again"""
+        entity = entity_pool.acquire(id="pooled", type="person", name="Pooled",
+                                     attributes={"age": 1}, source="test")
+        entity_pool.release(entity)
+        assert entity.attributes == {}
+        
+        reused = entity_pool.acquire(id="pooled_2", type="organization", name="Reused",
+                                     attributes={}, source="test", confidence=0.5)
+        assert reused is entity
+        assert reused.id == "pooled_2"
+        assert reused.confidence == 0.5
+        entity_pool.release(reused)
+    
     def test_delete_nonexistent_entity(self, kg):
         """Test deleting a non-existent entity"""
         with pytest.raises(EntityNotFoundError):
@@ -191,6 +232,19 @@ class TestKnowledgeGraph:
         assert len(paths) >= 1
         assert ["person_1", "company_1"] in paths
     
+    def test_find_connections_invalidated_on_mutation(self, kg, sample_entities):
+        """Test memoized paths and networks are dropped after a mutation"""
+        for entity in sample_entities:
+            kg.add_entity(entity)
+        kg.add_relationship("person_1", "person_2", "knows")
+        
+        assert kg.find_connections("person_1", "company_1") == []
+        assert len(kg.get_entity_network("person_1")["nodes"]) == 2
+        
+        kg.add_relationship("person_2", "company_1", "works_for")
+        assert kg.find_connections("person_1", "company_1") == [["person_1", "person_2", "company_1"]]
+        assert len(kg.get_entity_network("person_1")["nodes"]) == 3
+    
     def test_find_connections_no_path(self, kg, sample_entities):
         """Test finding connections when no path exists"""
         # Add entities but no relationships
@@ -249,6 +303,53 @@ class TestKnowledgeGraph:
         assert len(results) == 1
         assert results[0]["id"] == "company_1"
     
+    def test_search_entities_substring(self, kg, sample_entities):
+        """Test searching by partial names after updates and deletes"""
+        for entity in sample_entities:
+            kg.add_entity(entity)
+        
+        results = kg.search_entities("lic")
+        assert [r["id"] for r in results] == ["person_1"]
+        
+        kg.update_entity("person_1", {"name": "Alicia Smith"})
+        assert [r["id"] for r in kg.search_entities("alicia")] == ["person_1"]
+        assert kg.search_entities("Alice") == []
+        
+        kg.delete_entity("person_1")
+        assert kg.search_entities("alicia") == []
+    
+    def test_search_entities_insertion_order(self, kg):
+        """Test indexed searches return entities in insertion order"""
+        for entity_id in ["zeta", "alpha", "mid"]:
+            kg.add_entity(Entity(id=entity_id, type="person", name=f"{entity_id} Walker",
+                                 attributes={}, source="test"))
+        kg.update_entity("zeta", {"name": "Zeta Walker"})
+        
+        assert [r["id"] for r in kg.search_entities("Walker")] == ["zeta", "alpha", "mid"]
+        assert [r["id"] for r in kg.search_entities("Wa")] == ["zeta", "alpha", "mid"]
+        
+        kg.delete_entity("zeta")
+        kg.add_entity(Entity(id="zeta", type="person", name="Zeta Walker", attributes={}, source="test"))
+        assert [r["id"] for r in kg.search_entities("Walker")] == ["alpha", "mid", "zeta"]
+    
+    def test_search_entities_with_filters(self, kg, sample_entities):
+        """Test range and exact attribute filters follow updates"""
+        for entity in sample_entities:
+            kg.add_entity(entity)
+        
+        results = kg.search_entities("", filters={"age": {"min": 30, "max": 40}})
+        assert [r["id"] for r in results] == ["person_2"]
+        
+        results = kg.search_entities("", filters={"city": "Boston"})
+        assert [r["id"] for r in results] == ["person_1"]
+        
+        kg.update_entity("person_1", {"attributes": {"age": 32}})
+        results = kg.search_entities("Smith", filters={"age": {"min": 30, "max": 40}})
+        assert [r["id"] for r in results] == ["person_1"]
+        
+        results = kg.search_entities("", filters={"size": {"min": 0, "max": 10}})
+        assert results == []
+    
     def test_search_entities_no_results(self, kg):
         """Test searching with no results"""
         results = kg.search_entities("nonexistent")
@@ -274,6 +375,104 @@ class TestKnowledgeGraph:
         assert 0 <= stats["density"] <= 1
         assert stats["connected_components"] == 1
     
+    def test_graph_stats_smoke(self, kg):
+        """Test statistics of an empty graph"""
+        stats = kg.get_graph_stats()
+        
+        assert stats["nodes"] == 0
+        assert stats["edges"] == 0
+        assert stats["entity_types"] == {}
+        assert stats["density"] == 0
+        assert stats["connected_components"] == 0
+        assert stats["avg_clustering"] == 0.0
+    
+    def test_get_graph_stats_invalidated_on_mutation(self, kg, sample_entities):
+        """Test cached graph statistics reflect later mutations"""
+        kg.add_entity(sample_entities[0])
+        assert kg.get_graph_stats()["nodes"] == 1
+        
+        kg.add_entity(sample_entities[1])
+        kg.add_relationship("person_1", "person_2", "knows")
+        stats = kg.get_graph_stats()
+        assert stats["nodes"] == 2
+        assert stats["edges"] == 1
+        
+        kg.delete_entity("person_2")
+        stats = kg.get_graph_stats()
+        assert stats["nodes"] == 1
+        assert stats["edges"] == 0
+    
+    def test_get_graph_stats_matches_networkx(self, kg, sample_entities):
+        """Test incrementally maintained statistics agree with networkx"""
+        for entity in sample_entities:
+            kg.add_entity(entity)
+        kg.add_entity(Entity(id="person_3", type="person", name="Carol White",
+                             attributes={}, source="test"))
+        
+        kg.add_relationship("person_1", "person_2", "knows")
+        kg.add_relationship("person_1", "person_2", "works_with")
+        kg.add_relationship("person_2", "company_1", "works_for")
+        kg.add_relationship("company_1", "person_1", "employs")
+        kg.add_relationship("company_1", "person_3", "employs")
+        
+        def expected_stats():
+            simple = nx.Graph(kg.graph.edges())
+            return {
+                "edges": kg.graph.number_of_edges(),
+                "density": pytest.approx(nx.density(kg.graph)),
+                "connected_components": nx.number_connected_components(kg.graph),
+                "avg_clustering": pytest.approx(nx.average_clustering(simple)),
+            }
+        
+        stats = kg.get_graph_stats()
+        assert {key: stats[key] for key in expected_stats()} == expected_stats()
+        
+        kg.delete_entity("company_1")
+        stats = kg.get_graph_stats()
+        assert {key: stats[key] for key in expected_stats()} == expected_stats()
+        assert stats["connected_components"] == 2
+    
+    def test_failed_add_leaves_graph_stats_unchanged(self, kg, sample_entity):
+        """Test a rejected entity is not counted by the incremental statistics"""
+        kg.add_entity(sample_entity)
+        
+        bad = Entity(id="bad", type="person", name="Bad", attributes={"source": "x"}, source="test")
+        with pytest.raises(GraphError):
+            kg.add_entity(bad)
+        
+        stats = kg.get_graph_stats()
+        assert "bad" not in kg.graph
+        assert stats["nodes"] == 1
+        assert stats["connected_components"] == 1
+    
+    def test_add_entities_rejects_reserved_attributes(self, kg, sample_entities):
+        """Test the batch and single-add paths reject the same reserved attribute names"""
+        bad = Entity(id="bad", type="person", name="Bad",
+                     attributes={"type": "org", "source": "x"}, source="test")
+        
+        with pytest.raises(GraphError, match="reserved"):
+            kg.add_entity(bad)
+        with pytest.raises(GraphError, match="reserved"):
+            kg.add_entities(sample_entities + [bad])
+        
+        assert kg.entity_index == {}
+        assert kg.graph.number_of_nodes() == 0
+        assert kg.get_graph_stats()["connected_components"] == 0
+    
+    def test_clear(self, kg, sample_entities):
+        """Test clearing all graph state"""
+        for entity in sample_entities:
+            kg.add_entity(entity)
+        kg.add_relationship("person_1", "person_2", "knows")
+        
+        kg.clear()
+        
+        assert kg.graph.number_of_nodes() == 0
+        assert kg.graph.number_of_edges() == 0
+        assert kg.entity_index == {}
+        assert kg.type_index == {}
+        assert kg.attribute_index == {}
+    
     def test_get_neighbors(self, kg, sample_entities):
         """Test getting neighboring entities"""
         # Add entities and relationships
@@ -293,6 +492,26 @@ class TestKnowledgeGraph:
         neighbors = kg.get_neighbors("person_1", depth=2)
         assert len(neighbors) == 2  # person_2 and company_1
     
+    def test_get_neighbors_depth(self, kg, sample_entities):
+        """Test multi-hop neighbors match networkx and follow mutations"""
+        for entity in sample_entities:
+            kg.add_entity(entity)
+        kg.add_entity(Entity(id="person_3", type="person", name="Carol White",
+                             attributes={}, source="test"))
+        
+        kg.add_relationship("person_1", "person_2", "knows")
+        kg.add_relationship("person_1", "person_2", "works_with")
+        kg.add_relationship("person_2", "company_1", "works_for")
+        kg.add_relationship("company_1", "person_3", "employs")
+        
+        for depth in (2, 3):
+            expected = set(nx.ego_graph(kg.graph, "person_1", radius=depth)) - {"person_1"}
+            assert kg.get_neighbors("person_1", depth=depth) == expected
+        assert kg.get_neighbors("person_1", depth=2) == {"person_2", "company_1"}
+        
+        kg.delete_entity("company_1")
+        assert kg.get_neighbors("person_1", depth=3) == {"person_2"}
+    
     def test_get_neighbors_nonexistent(self, kg):
         """Test getting neighbors for non-existent entity"""
         with pytest.raises(EntityNotFoundError):
@@ -309,17 +528,25 @@ class TestKnowledgeGraph:
         assert entity_dict["attributes"] == sample_entity.attributes
         assert "degree" in entity_dict
     
-    @patch('src.core.graph.redis.Redis')
-    def test_cache_initialization(self, mock_redis):
-        """Test Redis cache initialization"""
-        mock_redis_instance = Mock()
-        mock_redis.return_value = mock_redis_instance
-        mock_redis_instance.ping.return_value = True
+    def test_entity_to_dict_invalidated_on_mutation(self, kg, sample_entities):
+        """Test memoized entity dictionaries reflect later mutations"""
+        kg.add_entity(sample_entities[0])
+        kg.add_entity(sample_entities[1])
         
+        assert kg._entity_to_dict(sample_entities[0])["degree"] == 0
+        
+        kg.add_relationship("person_1", "person_2", "knows")
+        assert kg._entity_to_dict(sample_entities[0])["degree"] == 1
+        
+        kg.update_entity("person_1", {"name": "Alice Brown"})
+        assert kg._entity_to_dict(sample_entities[0])["name"] == "Alice Brown"
+    
+    def test_cache_initialization(self):
+        """Test Redis cache initialization"""
         kg = KnowledgeGraph(use_cache=True)
         
         assert kg.redis is not None
-        mock_redis_instance.ping.assert_called_once()
+        assert kg.redis.ping_calls == 1
     
     def test_cache_disabled(self, kg):
         """Test operation with cache disabled"""
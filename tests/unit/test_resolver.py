@@ -3,6 +3,7 @@
 Unit tests for Entity Resolution service
 """
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import Mock, patch
 import sys
@@ -11,7 +12,8 @@ import os
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from src.core.resolver import EntityResolver, ResolutionConfig, MatchResult
+from src.core.resolver import EntityResolver, ResolutionConfig, MatchResult, LSHBlocker
+from src.core import resolver as resolver_module
 from argus.exceptions import EntityResolutionError
 
 
@@ -132,6 +134,75 @@ class TestEntityResolver:
         assert result.similarity_score > 0  # Should have some similarity
         assert "field_similarities" in result.match_details
     
+    def test_resolve_single_pair_exact_score_for_clear_non_match(self):
+        """Test non-matches ruled out by cheap fields still report their exact score"""
+        resolver = EntityResolver(ResolutionConfig(weights={"name": 0.2, "age": 0.8}))
+        entity1 = {"id": "e1", "name": "John Smith", "age": 20}
+        entity2 = {"id": "e2", "name": "John Smith", "age": 90}
+        
+        result = resolver.resolve_single_pair(entity1, entity2)
+        
+        assert result.match_type == "non_match"
+        assert result.match_details["field_similarities"]["name"] == 1.0
+        assert result.similarity_score == pytest.approx(0.2)
+    
+    def test_resolve_pairs_prunes_string_fields(self, resolver):
+        """Test realistic records whose dates of birth differ skip the string kernels"""
+        entities = [
+            {"id": "p1", "name": "John Smith", "dob": "1990-01-15", "address": "123 Main St"},
+            {"id": "p2", "name": "John Smith", "dob": "1990-01-15", "address": "123 Main St."},
+            {"id": "p3", "name": "John Smith", "dob": "1972-08-30", "address": "123 Main St"},
+            {"id": "p4", "name": "Jon Smith", "dob": "1985-03-02", "address": "9 Elm Road"}
+        ]
+        pairs = [(i, j) for i in range(len(entities)) for j in range(i + 1, len(entities))]
+        compared = []
+        calculate_pairs = resolver.string_calculator.calculate_pairs
+        
+        def spy(values1, values2, *args):
+            compared.extend(zip(values1, values2))
+            return calculate_pairs(values1, values2, *args)
+        
+        with patch.object(resolver.string_calculator, 'calculate_pairs', side_effect=spy):
+            results = resolver._resolve_pairs(entities, pairs, matches_only=True)
+        
+        # Only (p1, p2) shares a date of birth, so only its names and
+        # addresses are compared
+        assert len(compared) == 2
+        assert [(r.entity1_id, r.entity2_id) for r in results if r is not None] == [("p1", "p2")]
+        assert results[0] == resolver.resolve_single_pair(entities[0], entities[1])
+    
+    def test_resolve_single_pair_cache(self, sample_entities):
+        """Test cached pair results are reused in either order until cleared"""
+        resolver = EntityResolver(ResolutionConfig(cache_similarities=True))
+        entity1, entity2 = sample_entities[0], sample_entities[1]
+        
+        first = resolver.resolve_single_pair(entity1, entity2)
+        with patch.object(resolver.string_calculator, 'calculate') as mock_calculate:
+            swapped = resolver.resolve_single_pair(entity2, entity1)
+        
+        mock_calculate.assert_not_called()
+        assert (swapped.entity1_id, swapped.entity2_id) == ("person_2", "person_1")
+        assert swapped.similarity_score == first.similarity_score
+        
+        resolver.clear_cache()
+        assert resolver._pair_cache == {}
+    
+    def test_resolve_single_pair_cache_skips_pairs_without_distinct_ids(self):
+        """Test pairs with missing, None or equal ids are scored, not served from cache"""
+        resolver = EntityResolver(ResolutionConfig(cache_similarities=True))
+        alice = {"name": "Alice Smith", "type": "person"}
+        bob = {"name": "Bob Jones", "type": "person"}
+        
+        for entity_id in (None, "same"):
+            unlike = resolver.resolve_single_pair({**alice, "id": entity_id}, {**bob, "id": entity_id})
+            alike = resolver.resolve_single_pair({**alice, "id": entity_id}, {**alice, "id": entity_id})
+            assert alike.similarity_score > unlike.similarity_score
+        
+        unlike = resolver.resolve_single_pair(alice, bob)
+        alike = resolver.resolve_single_pair(alice, dict(alice))
+        assert alike.similarity_score > unlike.similarity_score
+        assert resolver._pair_cache == {}
+    
     def test_find_duplicate_entities(self, resolver, sample_entities):
         """Test finding duplicate entities in a batch"""
         duplicates = resolver.find_duplicate_entities(sample_entities)
@@ -145,6 +216,90 @@ class TestEntityResolver:
             assert duplicate.match_type == "match"
             assert duplicate.confidence >= 0.8
     
+    def test_candidate_pairs_blocking(self, resolver, sample_entities):
+        """Test only entities sharing a blocking key become candidate pairs"""
+        pairs = resolver._candidate_pairs(sample_entities)
+        
+        # Jane Doe shares no key with the John/Jon Smith records
+        assert pairs == [(0, 1), (0, 3), (1, 3)]
+    
+    def test_candidate_pairs_max_block_size(self, sample_entities):
+        """Test oversized blocks are truncated to their lowest ids"""
+        resolver = EntityResolver(ResolutionConfig(max_block_size=2))
+        
+        assert resolver._candidate_pairs(sample_entities) == [(0, 1)]
+        assert resolver._candidate_pairs(sample_entities[::-1]) == [(2, 3)]
+    
+    def test_candidate_pairs_rare_address_tokens(self):
+        """Test entities sharing a rare address token become candidate pairs"""
+        entities = [
+            {"id": f"e{i}", "name": name, "address": f"{i} Main St"}
+            for i, name in enumerate(["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi"])
+        ]
+        entities[1]["address"] = "12 Wisteria Lane"
+        entities[5]["address"] = "Wisteria Lane, Apt B"
+        
+        resolver = EntityResolver(ResolutionConfig(rare_token_blocking=True, rare_token_min_idf=1.0))
+        
+        assert resolver._candidate_pairs(entities) == [(1, 5)]
+        assert EntityResolver()._candidate_pairs(entities) == []
+    
+    def test_lsh_blocker(self):
+        """Test MinHash LSH buckets near-duplicate texts together"""
+        blocker = LSHBlocker(threshold=0.65)
+        keys = set(blocker.band_keys("Katherine Johnson 12 Harbour Road"))
+        
+        assert len(keys) == blocker.bands
+        assert keys & set(blocker.band_keys("Catherine Johnson 12 Harbour Road"))
+        assert not keys & set(blocker.band_keys("Jane Doe 456 Oak Ave"))
+        assert blocker.band_keys("") == []
+    
+    def test_candidate_pairs_lsh(self):
+        """Test LSH blocking finds near duplicates the exact keys miss"""
+        entities = [
+            {"id": "a", "name": "Xavier Alvarez", "address": "12 Harbour Road, Dubai"},
+            {"id": "b", "name": "Javier Alvarez", "address": "12 Harbour Road, Dubai"},
+            {"id": "c", "name": "Jane Doe", "address": "9 Oak Ave"}
+        ]
+        resolver = EntityResolver(ResolutionConfig(blocking_methods=["phonetic", "exact", "lsh"]))
+        
+        assert EntityResolver()._candidate_pairs(entities) == []
+        assert resolver._candidate_pairs(entities) == [(0, 1)]
+    
+    def test_find_duplicate_entities_collapses_identical(self, resolver, sample_entities):
+        """Test identical records are matched without going through blocking"""
+        entities = sample_entities + [dict(sample_entities[0], id="person_5")]
+        
+        with patch.object(resolver, '_candidate_pairs', wraps=resolver._candidate_pairs) as mock_pairs:
+            duplicates = resolver.find_duplicate_entities(entities)
+        
+        # person_1, person_4 and person_5 collapse into one representative
+        assert len(mock_pairs.call_args[0][0]) == 3
+        pairs = {(d.entity1_id, d.entity2_id) for d in duplicates}
+        assert {("person_1", "person_4"), ("person_1", "person_5"), ("person_4", "person_5")} <= pairs
+    
+    def test_find_duplicate_entities_interns_categorical_fields(self, resolver, sample_entities):
+        """Test repeated categorical values are interned without touching the input"""
+        for entity in sample_entities:
+            entity["dob"] = "".join(entity["dob"])
+            entity["country"] = "".join(["U", "S"])
+        originals = [dict(entity) for entity in sample_entities]
+        seen = []
+        candidate_pairs = resolver._candidate_pairs
+        
+        def spy(entities):
+            seen.extend(entities)
+            return candidate_pairs(entities)
+        
+        with patch.object(resolver, '_candidate_pairs', side_effect=spy):
+            duplicates = resolver.find_duplicate_entities(sample_entities)
+        
+        assert seen[0]["country"] is seen[1]["country"]
+        assert seen[0]["dob"] is seen[1]["dob"]
+        assert sample_entities == originals
+        assert sample_entities[0]["country"] is not sample_entities[1]["country"]
+        assert duplicates
+    
     def test_find_duplicate_entities_by_type(self, resolver, sample_entities):
         """Test finding duplicates filtered by entity type"""
         duplicates = resolver.find_duplicate_entities(sample_entities, entity_type="person")
@@ -208,6 +363,21 @@ class TestEntityResolver:
         # Should resolve conflicts based on confidence weights
         assert canonical["age"] == 30  # Higher total confidence for age 30
         assert canonical["city"] == "New York"  # Higher total confidence for New York
+
+    def test_canonicalize_entity_missing_attributes(self, resolver):
+        """Test that confidence follows the entity holding each value"""
+        entities = [
+            {"id": "e1", "age": 30, "city": "New York", "confidence": 0.9},
+            {"id": "e2", "city": "Boston", "confidence": 0.2},
+            {"id": "e3", "age": 31, "city": "Boston", "confidence": 0.8},
+            {"id": "e4", "age": 31, "city": None, "confidence": 0.3},
+        ]
+
+        canonical = resolver.canonicalize_entity(entities)
+
+        assert canonical["age"] == 31
+        assert type(canonical["age"]) is int
+        assert canonical["city"] == "Boston"
     
     def test_get_resolution_statistics(self, resolver, sample_entities):
         """Test getting resolution statistics"""
@@ -261,6 +431,50 @@ class TestEntityResolver:
         # Should have at least one result based on our mock
         assert len(results) >= 0
     
+    def test_blocking_duckdb_matches_recordlinkage(self, resolver, monkeypatch):
+        """Test DuckDB blocking yields the same pairs as the recordlinkage indexer"""
+        pytest.importorskip("duckdb")
+        df = pd.DataFrame(
+            {"name": ["Xavier", "Yusuf", "xena", "Xia", None], "country": ["US", "US", "UK", None, "US"]},
+            index=[10, 11, 12, 13, 14]
+        )
+        
+        monkeypatch.setattr(resolver_module, "POLARS_AVAILABLE", False)
+        
+        pairs = resolver._blocking(df.copy())
+        monkeypatch.setattr(resolver_module, "DUCKDB_AVAILABLE", False)
+        
+        assert pairs.tolist() == resolver._blocking(df.copy()).tolist()
+        assert pairs.tolist() == [(11, 10), (12, 10), (13, 10), (13, 12), (14, 10), (14, 11)]
+    
+    def test_blocking_polars_matches_recordlinkage(self, resolver, monkeypatch):
+        """Test Polars blocking yields the same pairs as the recordlinkage indexer"""
+        pytest.importorskip("polars")
+        df = pd.DataFrame(
+            {"name": ["Xavier", "Yusuf", "xena", "Xia", None], "country": ["US", "US", "UK", None, "US"]},
+            index=[10, 11, 12, 13, 14]
+        )
+        
+        # Polars takes precedence over DuckDB whenever it is installed
+        with patch.object(resolver, "_blocking_duckdb", side_effect=AssertionError("DuckDB used")):
+            pairs = resolver._blocking(df.copy())
+        monkeypatch.setattr(resolver_module, "POLARS_AVAILABLE", False)
+        monkeypatch.setattr(resolver_module, "DUCKDB_AVAILABLE", False)
+        
+        assert pairs.tolist() == resolver._blocking(df.copy()).tolist()
+        assert pairs.tolist() == [(11, 10), (12, 10), (13, 10), (13, 12), (14, 10), (14, 11)]
+    
+    def test_cluster_matches(self, resolver):
+        """Test matched pairs are grouped into DBSCAN clusters"""
+        matches = pd.DataFrame(
+            {"overall_similarity": [0.95, 0.9, 0.92]},
+            index=pd.MultiIndex.from_tuples([(1, 0), (3, 0), (5, 4)])
+        )
+        
+        clusters = resolver._cluster_matches(matches, pd.DataFrame())
+        
+        assert sorted(clusters.values()) == [[0, 1, 3], [4, 5]]
+    
     def test_string_similarity_calculator(self, resolver):
         """Test string similarity calculation"""
         calculator = resolver.string_calculator
@@ -281,6 +495,97 @@ class TestEntityResolver:
         similarity = calculator.calculate("", "John Smith")
         assert similarity == 0.0
     
+    def test_string_similarity_matches_fuzzywuzzy(self, resolver):
+        """Test the direct Levenshtein kernel scores like fuzz.ratio"""
+        from fuzzywuzzy import fuzz
+        
+        calculator = resolver.string_calculator
+        pairs = [
+            ("john smith", "jon smith"),
+            ("123 main st", "123 main street"),
+            ("jane doe", "john smith"),
+            ("a", "b"),
+        ]
+        for value1, value2 in pairs:
+            assert calculator.calculate(value1, value2) == fuzz.ratio(value1, value2) / 100.0
+    
+    def test_string_similarity_calculate_pairs(self, resolver):
+        """Test vectorized pair scoring agrees with the single-pair path"""
+        calculator = resolver.string_calculator
+        values1 = ["John Smith", "123 Main St", "", " ", None, "Jane Doe"]
+        values2 = ["Jon Smith", "123 Main Street", "x", " ", "x", "jane doe"]
+        
+        scores = calculator.calculate_pairs(values1, values2)
+        
+        assert scores.tolist() == [
+            calculator.calculate(v1, v2) for v1, v2 in zip(values1, values2)
+        ]
+    
+    def test_resolve_pairs_matches_single_pair(self, resolver, sample_entities):
+        """Test batch pair resolution gives the same results as resolve_single_pair"""
+        pairs = [(i, j) for i in range(len(sample_entities)) for j in range(i + 1, len(sample_entities))]
+        
+        results = resolver._resolve_pairs(sample_entities, pairs)
+        
+        assert results == [
+            resolver.resolve_single_pair(sample_entities[i], sample_entities[j]) for i, j in pairs
+        ]
+    
+    def test_resolve_pairs_matches_only(self, resolver, sample_entities):
+        """Test score cutoffs do not change which pairs are matches"""
+        pairs = [(i, j) for i in range(len(sample_entities)) for j in range(i + 1, len(sample_entities))]
+        
+        results = [
+            result for result in resolver._resolve_pairs(sample_entities, pairs, matches_only=True)
+            if result is not None and result.match_type == "match"
+        ]
+        
+        assert results == [
+            result for result in resolver._resolve_pairs(sample_entities, pairs)
+            if result.match_type == "match"
+        ]
+        assert ("person_1", "person_4") in [(r.entity1_id, r.entity2_id) for r in results]
+    
+    def test_resolve_pairs_threaded(self, sample_entities, monkeypatch):
+        """Test sharding pairs across threads gives the same results as one shard"""
+        pairs = [(i, j) for i in range(len(sample_entities)) for j in range(i + 1, len(sample_entities))]
+        expected = EntityResolver(ResolutionConfig(n_workers=1))._resolve_pairs(sample_entities, pairs)
+        
+        monkeypatch.setattr(resolver_module, "MIN_PAIRS_PER_SHARD", 1)
+        threaded = EntityResolver(ResolutionConfig(n_workers=3))
+        
+        assert threaded._resolve_pairs(sample_entities, pairs) == expected
+    
+    def test_compiled_combine(self, resolver):
+        """Test the generated combine function sums fields in weight order"""
+        sims = [0.9, 0.0, 0.7]
+        
+        expected = 0.0
+        for similarity, weight in zip(sims, resolver.config.weights.values()):
+            expected += similarity * weight
+        assert resolver._combine(*sims) == expected
+    
+    def test_compiled_combine_follows_weight_changes(self, resolver, sample_entities):
+        """Test scores use the new weights after update_config"""
+        resolver.resolve_single_pair(sample_entities[0], sample_entities[1])
+        
+        resolver.update_config(weights={**resolver.config.weights, "name": 0.0})
+        result = resolver.resolve_single_pair(sample_entities[0], sample_entities[1])
+        
+        similarities = result.match_details["field_similarities"]
+        assert result.similarity_score == pytest.approx(
+            (similarities["dob"] * 0.3 + similarities["address"] * 0.2) / 0.5
+        )
+    
+    def test_weighted_sum_kernel(self):
+        """Test the weighted-score kernel sums fields in order like the fallback"""
+        sims = np.array([[0.9, 0.0, 1.0], [1.0, 0.5, 0.0], [0.3, 0.7, 0.2]])
+        weights = np.array([0.4, 0.3, 0.3])
+        
+        expected = [sum(sims[f, i] * weights[f] for f in range(3)) for i in range(3)]
+        assert resolver_module._weighted_sum(sims, weights).tolist() == expected
+        assert resolver_module._weighted_sum_numpy(sims, weights).tolist() == expected
+    
     def test_numeric_similarity_calculator(self, resolver):
         """Test numeric similarity calculation"""
         calculator = resolver.numeric_calculator
@@ -301,6 +606,36 @@ class TestEntityResolver:
         similarity = calculator.calculate(None, 30)
         assert similarity == 0.0
     
+    def test_numeric_similarity_calculate_array(self, resolver):
+        """Test vectorized numeric similarity matches the scalar calculation"""
+        calculator = resolver.numeric_calculator
+        values1 = np.array([30.0, 30.0, 30.0, np.nan])
+        values2 = np.array([30.0, 32.0, 50.0, 30.0])
+        
+        sims = calculator.calculate_array(values1, values2)
+        
+        assert sims.tolist() == pytest.approx([
+            calculator.calculate(30, 30),
+            calculator.calculate(30, 32),
+            calculator.calculate(30, 50),
+            calculator.calculate(None, 30)
+        ])
+    
+    def test_resolve_single_pair_dob_epoch_days(self, resolver):
+        """Test ISO dates of birth are compared as day distances"""
+        entity1 = {"id": "e1", "name": "John Smith", "dob": "1990-01-15"}
+        entity2 = {"id": "e2", "name": "John Smith", "dob": "1990-01-16"}
+        entity3 = {"id": "e3", "name": "John Smith", "dob": "1991-01-15"}
+        
+        close = resolver.resolve_single_pair(entity1, entity2)
+        far = resolver.resolve_single_pair(entity1, entity3)
+        
+        assert close.match_details["field_similarities"]["dob"] == pytest.approx(
+            resolver.numeric_calculator.calculate(0, 1)
+        )
+        assert far.match_details["field_similarities"]["dob"] == pytest.approx(0.0)
+        assert resolver._resolve_pairs([entity1, entity2, entity3], [(0, 1), (0, 2)]) == [close, far]
+    
     def test_config_validation(self):
         """Test ResolutionConfig validation"""
         # Test default values